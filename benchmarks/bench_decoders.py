@@ -0,0 +1,58 @@
+"""
+Micro-benchmark of the JSON decoding backends on large recorded response bodies.
+
+Record a run first (pytest --record), then:
+
+    python -m benchmarks.bench_decoders --cassette-dir cassettes --bodies 5 --repeat 20
+"""
+import argparse
+import json
+import sys
+import timeit
+
+from utils.cassette import DEFAULT_CASSETTE_DIR, Cassette
+from utils.decoding import AVAILABLE_BACKENDS, decode_body
+from utils.events import event_from_url
+
+
+def largest_bodies(cassette, count):
+    """Returns (url, event, body bytes) for the count largest recorded 200 responses."""
+    bodies = []
+    for entry in cassette.index.values():
+        if entry["status"] != 200:
+            continue
+        content = cassette.store.get(entry["body"])
+        if content is not None:
+            bodies.append((entry["url"], event_from_url(entry["url"]), content))
+    bodies.sort(key=lambda item: len(item[2]), reverse=True)
+    return bodies[:count]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cassette-dir", default=DEFAULT_CASSETTE_DIR)
+    parser.add_argument("--bodies", type=int, default=5, help="Number of the largest recorded bodies to decode.")
+    parser.add_argument("--repeat", type=int, default=20, help="Decodes per body and backend.")
+    args = parser.parse_args(argv)
+
+    bodies = largest_bodies(Cassette(args.cassette_dir), args.bodies)
+    if not bodies:
+        print(f"No recorded bodies in {args.cassette_dir}, run pytest --record first.")
+        return 1
+
+    print(f"{'body':<48} {'backend':<8} {'typed':<6} {'ms/decode':>10} {'MB/s':>8}")
+    for url, event, content in bodies:
+        rows = len(json.loads(content).get("values", []))
+        name = f"{url.rsplit('/', 1)[-1]} ({rows} rows, {len(content) // 1024} KiB)"
+        for backend in AVAILABLE_BACKENDS:
+            for typed in (False, True):
+                seconds = min(timeit.repeat(
+                    lambda: decode_body(content, event, backend=backend, typed=typed),
+                    number=args.repeat, repeat=3)) / args.repeat
+                print(f"{name:<48} {backend:<8} {str(typed):<6} {seconds * 1000:>10.3f} "
+                      f"{len(content) / seconds / 1e6:>8.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,374 @@
+import random
+from urllib.parse import urlsplit
+
+import pytest
+
+from routes.indexer_endpoints import BASE_URL
+from utils.batching import batching_stats, configure_batching
+from utils.breaker import DEFAULT_BREAKER_RESET, DEFAULT_BREAKER_THRESHOLD, breaker_stats, configure_breaker
+from utils.cache import DEFAULT_CACHE_MAX_BYTES, DEFAULT_CACHE_TTL, cache_stats, configure_cache
+from utils.cassette import DEFAULT_CASSETTE_DIR, configure_cassette, seed_for
+from utils.congestion import DEFAULT_AIMD_INITIAL, DEFAULT_AIMD_MAX, configure_congestion, controller
+from utils.deadline import (
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+    breakdown,
+    configure_deadlines,
+    elapsed,
+    end_test,
+    over_budget,
+    start_test
+)
+from utils.decoding import AVAILABLE_BACKENDS, configure_decoder
+from utils.hedging import DEFAULT_HEDGE_BUDGET, DEFAULT_HEDGE_MIN_SAMPLES, configure_hedging, hedging_stats
+from utils.journal import close_journal, configure_journal
+from utils.log import (
+    DEFAULT_LOG_LEVEL,
+    DEFAULT_RING_SIZE,
+    LOG_LEVELS,
+    clear_ring,
+    configure_logging,
+    detach_foreign_handlers,
+    dump_ring
+)
+from utils.prefetch import (
+    DEFAULT_PREFETCH_PER_HOST,
+    DEFAULT_PREFETCH_WORKERS,
+    configure_prefetch,
+    discard,
+    shutdown_prefetch
+)
+from utils.ranges import configure_ranges, ranges_stats
+from utils.revalidation import DEFAULT_HTTP_CACHE_DIR, configure_revalidation, revalidation_stats
+from utils.session import DEFAULT_POOL_SIZE, configure_session, connection_stats, close_session, mount
+from utils.singleflight import singleflight_stats
+from utils.snapshot import DEFAULT_PROBE_INTERVAL, configure_snapshots, snapshot_stats
+from utils.spill import DEFAULT_MAX_BODY_SIZE, configure_spill, spill_stats
+from utils.timing import PHASES, close_timings, configure_timings, set_current_test, timing_stats
+from utils.transports import app_adapter, load_app
+from utils.wire import DEFAULT_ACCEPT_ENCODING, accept_encoding_header, wire_stats
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("indexer", "Stakeway indexer client")
+    group.addoption("--pool-size", type=int, default=DEFAULT_POOL_SIZE,
+                    help="Maximum number of keep-alive connections kept per indexer host.")
+    group.addoption("--accept-encoding", default=DEFAULT_ACCEPT_ENCODING,
+                    help="Comma separated content codings to negotiate, e.g. 'zstd,br,gzip' or 'identity'.")
+    group.addoption("--indexer-app", default=None,
+                    help="Dispatch requests for BASE_URL to an in-process WSGI or ASGI app, given as "
+                         "'module:attribute'.")
+    group.addoption("--indexer-log-level", choices=LOG_LEVELS, default=DEFAULT_LOG_LEVEL,
+                    help="Level of the client's log: DEBUG keeps a record per checked row, INFO one per request.")
+    group.addoption("--indexer-log-ring", type=int, default=DEFAULT_RING_SIZE,
+                    help="Most recent log records kept per test and shown when it fails.")
+    group.addoption("--connect-timeout", type=float, default=DEFAULT_CONNECT_TIMEOUT,
+                    help="Seconds to wait for a connection to the indexer.")
+    group.addoption("--read-timeout", type=float, default=DEFAULT_READ_TIMEOUT,
+                    help="Seconds to wait between two bytes of an indexer response.")
+    group.addoption("--test-budget", type=float, default=None,
+                    help="Seconds a test may take including its fixtures; requests are cut off at the deadline and "
+                         "a test over budget fails with a breakdown of its time.")
+    group.addoption("--max-body-size", type=int, default=DEFAULT_MAX_BODY_SIZE,
+                    help="Bytes of a response body held in memory; larger bodies are written to a temporary file "
+                         "and their rows parsed from it on access, without typed decoding. Off by default: every "
+                         "body is kept in memory.")
+    group.addoption("--spill-dir", default=None,
+                    help="Directory of the temporary files of --max-body-size; defaults to the system's.")
+    group.addoption("--prefetch", action="store_true", default=False,
+                    help="Pin one sample per module and URL and prefetch all of the module's queries in parallel.")
+    group.addoption("--prefetch-workers", type=int, default=DEFAULT_PREFETCH_WORKERS,
+                    help="Total number of prefetch worker threads.")
+    group.addoption("--prefetch-per-host", type=int, default=DEFAULT_PREFETCH_PER_HOST,
+                    help="Maximum number of prefetch requests in flight against one host.")
+    group.addoption("--batch-in", action="store_true", default=False,
+                    help="With --prefetch, answer the equality and FilterIn checks of one field and endpoint from a "
+                         "single FilterIn query, split up locally; their 'total' is then counted locally.")
+    group.addoption("--merge-ranges", action="store_true", default=False,
+                    help="With --prefetch, answer the Gt/Ge and Lt/Le checks of one field from one sorted superset "
+                         "query each, evaluated locally. This no longer tests the server's range filters.")
+    group.addoption("--no-snapshot", action="store_true", default=False,
+                    help="Fetch the unfiltered rows tests draw their samples from for every test, instead of once per "
+                         "URL while the endpoint's total and newest indexedAt are unchanged.")
+    group.addoption("--snapshot-probe-interval", type=float, default=DEFAULT_PROBE_INTERVAL,
+                    help="Seconds a snapshot is handed out before the endpoint is probed for changes again; "
+                         "0 probes before every test.")
+    group.addoption("--no-cache", action="store_true", default=False,
+                    help="Disable the in-memory response cache under fetch_get.")
+    group.addoption("--cache-max-bytes", type=int, default=DEFAULT_CACHE_MAX_BYTES,
+                    help="Upper bound for the summed body sizes kept in the response cache.")
+    group.addoption("--cache-ttl", type=float, default=DEFAULT_CACHE_TTL,
+                    help="Seconds a cached response stays valid.")
+    group.addoption("--record", action="store_true", default=False,
+                    help="Store every indexer response in the cassette directory.")
+    group.addoption("--replay", action="store_true", default=False,
+                    help="Answer every query from the cassette directory without touching the network.")
+    group.addoption("--cassette-dir", default=DEFAULT_CASSETTE_DIR,
+                    help="Directory of the recorded responses used by --record and --replay.")
+    group.addoption("--revalidate", action="store_true", default=False,
+                    help="Keep response bodies on disk and revalidate them with If-None-Match / If-Modified-Since.")
+    group.addoption("--http-cache-dir", default=DEFAULT_HTTP_CACHE_DIR,
+                    help="Directory of the on-disk cache used by --revalidate; kept between runs.")
+    group.addoption("--no-circuit-breaker", action="store_true", default=False,
+                    help="Keep sending queries to an endpoint that keeps failing instead of failing them fast.")
+    group.addoption("--breaker-threshold", type=int, default=DEFAULT_BREAKER_THRESHOLD,
+                    help="Consecutive failures, timeouts or 5xx responses that open an endpoint's circuit.")
+    group.addoption("--breaker-reset", type=float, default=DEFAULT_BREAKER_RESET,
+                    help="Seconds an open circuit fails queries fast before it lets a probe query through.")
+    group.addoption("--json-backend", choices=AVAILABLE_BACKENDS, default=None,
+                    help="JSON backend for response bodies; defaults to the fastest installed one, which differs "
+                         "with --typed-events.")
+    group.addoption("--typed-events", action="store_true", default=False,
+                    help="Decode event rows with their integer and uint256 fields already converted to int.")
+    group.addoption("--hedge", action="store_true", default=False,
+                    help="Duplicate a request still outstanding at its endpoint and query shape's p95 latency.")
+    group.addoption("--hedge-budget", type=float, default=DEFAULT_HEDGE_BUDGET,
+                    help="Fraction of all requests that may be duplicated by --hedge.")
+    group.addoption("--hedge-min-samples", type=int, default=DEFAULT_HEDGE_MIN_SAMPLES,
+                    help="Latencies a query shape, or else its endpoint, needs before --hedge duplicates "
+                         "its requests.")
+    group.addoption("--aimd", action="store_true", default=False,
+                    help="Adapt the number of in-flight requests: grow additively, halve on 429/5xx or latency spikes.")
+    group.addoption("--aimd-initial", type=int, default=DEFAULT_AIMD_INITIAL,
+                    help="Starting in-flight limit of --aimd.")
+    group.addoption("--aimd-max", type=int, default=DEFAULT_AIMD_MAX,
+                    help="Upper bound of the --aimd in-flight limit.")
+    group.addoption("--aimd-log", default=None,
+                    help="Write the --aimd concurrency trajectory to this CSV file.")
+    group.addoption("--journal", default=None,
+                    help="Append one JSON line per request to this file, e.g. request_journal.jsonl; "
+                         "summarize it with python -m utils.journal.")
+    group.addoption("--timings-file", default=None,
+                    help="Write DNS, connect, TLS, TTFB, download and decode times of every request to this "
+                         "JSON lines file.")
+
+
+def pytest_configure(config):
+    configure_logging(level=config.getoption("indexer_log_level"), ring_size=config.getoption("indexer_log_ring"))
+    try:
+        accept_encoding = accept_encoding_header(config.getoption("accept_encoding"))
+    except ValueError as e:
+        raise pytest.UsageError(str(e))
+    configure_session(pool_size=config.getoption("pool_size"), accept_encoding=accept_encoding)
+    configure_deadlines(connect_timeout=config.getoption("connect_timeout"),
+                        read_timeout=config.getoption("read_timeout"),
+                        budget=config.getoption("test_budget"))
+    configure_spill(max_body_size=config.getoption("max_body_size"), directory=config.getoption("spill_dir"))
+    if config.getoption("indexer_app"):
+        try:
+            app, interface = load_app(config.getoption("indexer_app"))
+        except (ImportError, AttributeError, ValueError) as e:
+            raise pytest.UsageError(f"--indexer-app: {e}")
+        base = urlsplit(BASE_URL)
+        mount(f"{base.scheme}://{base.netloc}/", app_adapter(app, interface))
+    configure_prefetch(enabled=config.getoption("prefetch"),
+                       workers=config.getoption("prefetch_workers"),
+                       per_host=config.getoption("prefetch_per_host"))
+    if config.getoption("batch_in") and not config.getoption("prefetch"):
+        raise pytest.UsageError("--batch-in batches the queries found by --prefetch and needs it.")
+    configure_batching(enabled=config.getoption("batch_in"))
+    if config.getoption("merge_ranges") and not config.getoption("prefetch"):
+        raise pytest.UsageError("--merge-ranges merges the queries found by --prefetch and needs it.")
+    configure_ranges(enabled=config.getoption("merge_ranges"))
+    configure_cache(enabled=not config.getoption("no_cache"),
+                    max_bytes=config.getoption("cache_max_bytes"),
+                    ttl=config.getoption("cache_ttl"))
+    configure_snapshots(enabled=not config.getoption("no_snapshot"),
+                        probe_interval=config.getoption("snapshot_probe_interval"))
+
+    if config.getoption("record") and config.getoption("replay"):
+        raise pytest.UsageError("--record and --replay cannot be used together.")
+    mode = "record" if config.getoption("record") else "replay" if config.getoption("replay") else None
+    configure_cassette(mode=mode, root=config.getoption("cassette_dir"))
+    configure_revalidation(enabled=config.getoption("revalidate"), root=config.getoption("http_cache_dir"))
+    configure_decoder(backend=config.getoption("json_backend"), typed=config.getoption("typed_events"))
+    configure_hedging(enabled=config.getoption("hedge"),
+                      budget=config.getoption("hedge_budget"),
+                      min_samples=config.getoption("hedge_min_samples"))
+    configure_breaker(enabled=not config.getoption("no_circuit_breaker"),
+                      threshold=config.getoption("breaker_threshold"),
+                      reset_timeout=config.getoption("breaker_reset"))
+    configure_congestion(enabled=config.getoption("aimd"),
+                         initial=config.getoption("aimd_initial"),
+                         maximum=config.getoption("aimd_max"))
+    configure_timings(path=config.getoption("timings_file"))
+    configure_journal(path=config.getoption("journal"))
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    # Requests sent during setup, call and teardown (fixture fetches included) are attributed to the test
+    set_current_test(item.nodeid, item.user_properties)
+    clear_ring()
+    start_test()
+    yield
+    end_test()
+    set_current_test(None)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    # A test over its budget fails with a breakdown of its time; the client's log is only formatted
+    # for failing tests
+    outcome = yield
+    report = outcome.get_result()
+    if report.when != "teardown" and over_budget():
+        spent = breakdown(item.user_properties, elapsed())
+        if report.passed:
+            report.outcome = "failed"
+            report.longrepr = f"Test ran past its time budget\n{spent}"
+        else:
+            report.sections.append(("indexer time budget", spent))
+    if report.failed:
+        records = dump_ring()
+        if records:
+            report.sections.append((f"Captured indexer log {report.when}", records))
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item):
+    # pytest's log capture attached its handlers to the client's loggers for this phase, see utils.log
+    detach_foreign_handlers()
+    # A recorded run and its replay must draw the same samples; the node id is not used because it
+    # depends on the rootdir pytest infers from the command line
+    seed = seed_for(f"{item.module.__name__}::{item.name}")
+    if seed is not None:
+        random.seed(seed)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_call(item):
+    detach_foreign_handlers()
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_teardown(item, nextitem):
+    detach_foreign_handlers()
+    # Drop prefetched results nobody asked for once the module is done
+    if nextitem is None or nextitem.module is not item.module:
+        discard(item.module.__name__)
+
+
+def pytest_terminal_summary(terminalreporter):
+    stats = connection_stats()
+    if stats:
+        terminalreporter.write_sep("-", "indexer connection pool")
+        for host, entry in sorted(stats.items()):
+            terminalreporter.write_line(
+                f"{host}: {entry['requests']} requests, {entry['new_connections']} new connections "
+                f"(handshakes), {entry['reused']} reused")
+
+    stats = cache_stats()
+    if stats:
+        terminalreporter.write_sep("-", "indexer response cache")
+        for endpoint, entry in sorted(stats.items()):
+            terminalreporter.write_line(
+                f"{endpoint}: {entry['hits']} hits, {entry['misses']} misses, "
+                f"{entry['bytes_saved']} bytes saved")
+
+    stats = revalidation_stats()
+    if stats:
+        terminalreporter.write_sep("-", "indexer revalidation")
+        for endpoint, entry in sorted(stats.items()):
+            ratio = entry["not_modified"] / entry["revalidations"] if entry["revalidations"] else 0
+            terminalreporter.write_line(
+                f"{endpoint}: {entry['not_modified']} of {entry['revalidations']} revalidations answered 304 "
+                f"({ratio:.0%}), {entry['bytes_saved']} bytes saved")
+
+    stats = snapshot_stats()
+    if stats["taken"]:
+        terminalreporter.write_sep("-", "indexer sample snapshots")
+        terminalreporter.write_line(
+            f"{stats['taken']} snapshots taken, handed out again {stats['reused']} times, "
+            f"{stats['invalidated']} fetched anew after the endpoint changed")
+
+    stats = batching_stats()
+    if stats["batches"]:
+        terminalreporter.write_sep("-", "indexer FilterIn batching")
+        terminalreporter.write_line(
+            f"{stats['queries']} queries answered by {stats['batches']} FilterIn queries, "
+            f"{stats['fallbacks']} sent on their own after all")
+
+    stats = ranges_stats()
+    if stats["batches"]:
+        terminalreporter.write_sep("-", "indexer range merging")
+        terminalreporter.write_line(
+            f"{stats['queries']} range queries answered by {stats['batches']} sorted queries, "
+            f"{stats['fallbacks']} sent on their own after all")
+
+    stats = {endpoint: entry for endpoint, entry in singleflight_stats().items() if entry["collapsed"]}
+    if stats:
+        terminalreporter.write_sep("-", "indexer single-flight")
+        for endpoint, entry in sorted(stats.items()):
+            terminalreporter.write_line(
+                f"{endpoint}: {entry['collapsed']} of {entry['calls']} requests collapsed into an in-flight one")
+
+    stats = breaker_stats()
+    if stats:
+        terminalreporter.write_sep("-", "indexer circuit breakers")
+        for endpoint, entry in sorted(stats.items()):
+            terminalreporter.write_line(
+                f"{endpoint}: {entry['state']}, tripped {entry['trips']} times, {entry['fast_failed']} queries "
+                f"failed fast, last error: {entry['last_error']}")
+
+    stats = hedging_stats()
+    if stats:
+        terminalreporter.write_sep("-", "indexer request hedging")
+        for (endpoint, shape), entry in sorted(stats.items()):
+            terminalreporter.write_line(
+                f"{endpoint} [{shape}]: {entry['requests']} requests, {entry['hedged']} hedged, "
+                f"{entry['hedge_won']} won by the hedge")
+
+    aimd = controller()
+    if aimd is not None:
+        limits = [limit for _, limit, _ in aimd.trajectory]
+        terminalreporter.write_sep("-", "indexer AIMD concurrency")
+        terminalreporter.write_line(
+            f"in-flight limit: start {limits[0]}, final {int(aimd.limit)}, min {min(limits)}, max {max(limits)}, "
+            f"{aimd.decreases} decreases, {len(aimd.trajectory) - 1} changes")
+        log_path = terminalreporter.config.getoption("aimd_log")
+        if log_path:
+            with open(log_path, "w") as f:
+                f.write("seconds,limit,reason\n")
+                for seconds, limit, reason in aimd.trajectory:
+                    f.write(f"{seconds:.3f},{limit},{reason}\n")
+            terminalreporter.write_line(f"trajectory written to {log_path}")
+
+    stats = spill_stats()
+    if stats["spilled"]:
+        terminalreporter.write_sep("-", "indexer spilled bodies")
+        terminalreporter.write_line(
+            f"{stats['spilled']} response bodies over {terminalreporter.config.getoption('max_body_size')} bytes "
+            f"parsed from disk, {stats['bytes']} bytes in total, largest {stats['largest']} bytes")
+
+    stats = timing_stats()
+    if stats["requests"]:
+        terminalreporter.write_sep("-", "indexer request phases")
+        total = sum(stats[phase] for phase in PHASES) or 1.0
+        terminalreporter.write_line(f"{stats['requests']} requests, " + ", ".join(
+            f"{phase} {stats[phase]:.2f}s ({stats[phase] / total:.0%})" for phase in PHASES))
+        timings_path = terminalreporter.config.getoption("timings_file")
+        if timings_path:
+            terminalreporter.write_line(f"per-request timings written to {timings_path}")
+
+    by_endpoint, by_shape = wire_stats()
+    if by_endpoint:
+        _write_wire_table(terminalreporter, "indexer bytes moved per endpoint", by_endpoint)
+        _write_wire_table(terminalreporter, "indexer bytes moved per filter type", by_shape)
+
+
+def _write_wire_table(terminalreporter, title, stats):
+    terminalreporter.write_sep("-", title)
+    terminalreporter.write_line(f"{'':<44} {'requests':>9} {'wire bytes':>14} {'body bytes':>14} {'ratio':>6}")
+    for name, entry in sorted(stats.items(), key=lambda item: item[1]["wire_bytes"], reverse=True):
+        ratio = entry["body_bytes"] / entry["wire_bytes"] if entry["wire_bytes"] else 0
+        terminalreporter.write_line(
+            f"{name:<44} {entry['requests']:>9} {entry['wire_bytes']:>14} {entry['body_bytes']:>14} {ratio:>6.1f}")
+
+
+def pytest_unconfigure(config):
+    configure_hedging(enabled=False)
+    shutdown_prefetch()
+    close_journal()
+    close_timings()
+    close_session()
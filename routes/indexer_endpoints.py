@@ -1,2 +1,4 @@
 
+# An http(s):// address, a Unix domain socket given as http+unix://<percent-encoded socket path>/,
+# or any address answered by an in-process WSGI/ASGI app passed with --indexer-app, e.g. http://indexer.local/
 BASE_URL = "Replace URL with the Stakeway address"
@@ -0,0 +1,205 @@
+import pytest
+from assertpy import assert_that
+
+from utils.assert_filters import (
+    assert_response_status,
+    assert_filter_correctness,
+    assert_ge_filter,
+    assert_gt_filter,
+    assert_le_filter,
+    assert_lt_filter,
+    assert_sorted_ascending,
+    assert_sorted_descending,
+    assert_response_object_count,
+    assert_tx_hash_filter,
+    assert_checking_the_eth_address_and_filter,
+    assert_value_filter,
+    assert_sorted_ascending_with_hexadecimal_values,
+    assert_sorted_descending_with_hexadecimal_values,
+    assert_sorted_ascending_with_string_values,
+    assert_sorted_descending_with_string_values
+)
+from utils.events import (
+    ADDRESS,
+    ASC,
+    EQ,
+    EQ_LIMITS,
+    EVENTS,
+    FULL_PAGE_LIMIT,
+    GE,
+    GT,
+    IN,
+    INDEXES,
+    INT,
+    IPFS_HASH,
+    LE,
+    LT,
+    ORDERS,
+    PUBLIC_KEY,
+    RANGES,
+    TX_HASH,
+    UINT256,
+    event_from_url,
+    event_urls,
+    field_checks
+)
+from utils.fetch import fetch_get
+from utils.log import get_logger
+from utils.prefetch import draw_sample
+from utils.random_data_limit_offset import get_random_limit
+from utils.snapshot import snapshot_values
+
+log = get_logger(__name__)
+
+# Assertion of an equality query by the kind of the filtered field
+EQ_ASSERTIONS = {
+    INT: assert_filter_correctness,
+    UINT256: assert_filter_correctness,
+    ADDRESS: assert_checking_the_eth_address_and_filter,
+    TX_HASH: assert_value_filter,
+    PUBLIC_KEY: assert_value_filter,
+    IPFS_HASH: assert_value_filter,
+}
+RANGE_ASSERTIONS = {GT: assert_gt_filter, GE: assert_ge_filter, LT: assert_lt_filter, LE: assert_le_filter}
+RANGE_FILTERS = {GT: "FilterGt", GE: "FilterGe", LT: "FilterLt", LE: "FilterLe"}
+# Assertions of the ascending and descending sort queries by the kind of the sorted field
+SORT_ASSERTIONS = {
+    INT: (assert_sorted_ascending, assert_sorted_descending),
+    UINT256: (assert_sorted_ascending, assert_sorted_descending),
+    ADDRESS: (assert_sorted_ascending_with_hexadecimal_values, assert_sorted_descending_with_hexadecimal_values),
+    TX_HASH: (assert_sorted_ascending_with_hexadecimal_values, assert_sorted_descending_with_hexadecimal_values),
+    PUBLIC_KEY: (assert_sorted_ascending_with_hexadecimal_values, assert_sorted_descending_with_hexadecimal_values),
+    IPFS_HASH: (assert_sorted_ascending_with_string_values, assert_sorted_descending_with_string_values),
+}
+# Checks each test runs; a test not listed runs once per endpoint
+TEST_CHECKS = {
+    "test_filter": (EQ,),
+    "test_range_filter": RANGES,
+    "test_sort": ORDERS,
+    "test_filter_in": (IN,),
+}
+
+
+def pytest_generate_tests(metafunc):
+    """
+    Parametrize each test with every endpoint of every event in utils.events.EVENTS, and with the fields and
+    checks of the event it runs, see utils.events.field_checks.
+    """
+    if "extract_values_from_response" not in metafunc.fixturenames:
+        return
+    checks = TEST_CHECKS.get(metafunc.function.__name__)
+    argnames = [name for name in ("extract_values_from_response", "field", "check") if name in metafunc.fixturenames]
+    params = []
+    ids = []
+    for event, fields in EVENTS.items():
+        for index, url in zip(INDEXES, event_urls(event)):
+            if checks is None:
+                params.append(url)
+                ids.append(f"{event}Idx{index}")
+                continue
+            for field in fields:
+                for check in field_checks(event, field):
+                    if check in checks:
+                        params.append((url, field, check)[:len(argnames)])
+                        ids.append("-".join([f"{event}Idx{index}", field, check][:len(argnames)]))
+    metafunc.parametrize(",".join(argnames), params, ids=ids, indirect=["extract_values_from_response"])
+
+
+def extract_values(event):
+    """
+    Returns the function extracting the rows of an event from the unfiltered response, each as a dict of its
+    fields: int for INT fields, str for the others.
+    """
+    fields = EVENTS[event]
+
+    def extract(body):
+        return [
+            {field: int(value[field]) if kind == INT else str(value[field]) for field, kind in fields.items()}
+            for value in body.get('values', [])
+        ]
+
+    return extract
+
+
+@pytest.fixture
+def extract_values_from_response(request):
+    """
+    Extract specific values from the response.
+    """
+    url = request.param  # Access the parameterized value
+
+    # Rows of the URL's snapshot, fetched again only once the endpoint's data changed
+    extracted_values = snapshot_values(url, extract_values(event_from_url(url)))
+
+    # Get a random sample of 3 values, ensuring there are at least 1 values to sample
+    if len(extracted_values) < 1:
+        reason = "Skipping test: Not enough values in the response to extract a sample of 1."
+        log.info(reason)
+        pytest.skip(reason)
+
+    random_values, several_values = draw_sample(request, extracted_values)
+    return url, random_values, several_values
+
+
+def test_filter(extract_values_from_response, field):
+    url, random_values, _ = extract_values_from_response
+    expected_value = random_values[field]
+    limit = EQ_LIMITS.get(field, FULL_PAGE_LIMIT)
+    query = f'{field}={expected_value}' if limit is None else f'{field}={expected_value}&limit={limit}'
+    resp, body = fetch_get(url, params=[query], stream=limit == FULL_PAGE_LIMIT)
+
+    assert_response_status(resp, 200)
+    if field == "txHash":
+        assert_tx_hash_filter(body, expected_value)
+    else:
+        EQ_ASSERTIONS[EVENTS[event_from_url(url)][field]](body, field, expected_value)
+
+
+def test_range_filter(extract_values_from_response, field, check):
+    url, random_values, _ = extract_values_from_response
+    expected_value = random_values[field]
+    resp, body = fetch_get(url, params=[f'{field}{RANGE_FILTERS[check]}={expected_value}'])
+
+    assert_response_status(resp, 200)
+    RANGE_ASSERTIONS[check](body, field, expected_value)
+
+
+def test_sort(extract_values_from_response, field, check):
+    url, _, _ = extract_values_from_response
+    resp, body = fetch_get(url, params=[f'{field}Sort{"Asc" if check == ASC else "Desc"}=True'])
+
+    assert_response_status(resp, 200)
+    ascending, descending = SORT_ASSERTIONS[EVENTS[event_from_url(url)][field]]
+    (ascending if check == ASC else descending)(body, field)
+
+
+def test_random_limit(extract_values_from_response):
+    url, _, _ = extract_values_from_response
+    random_limit = get_random_limit()
+    resp, body = fetch_get(url, params=[f'limit={random_limit}'])
+
+    assert_response_status(resp, 200)
+    assert_response_object_count(body, random_limit)
+
+
+def test_filter_in(extract_values_from_response, field):
+    url, _, several_values = extract_values_from_response
+    values = [item[field] for item in several_values]
+    filter_value = ','.join(map(str, values))
+
+    resp, body = fetch_get(url, params=[f"{field}FilterIn={filter_value}&limit={FULL_PAGE_LIMIT}"], stream=True)
+
+    assert_response_status(resp, 200)
+
+    obj_value_list = [obj[field] for obj in body["values"]]
+
+    # Assert the filter works correctly
+    assert_that(set(map(str, obj_value_list))).is_equal_to(set(map(str, values))).described_as(
+        f"The {field}FilterIn is not working correctly. "
+        f"Expected: '{set(values)}', but got: '{set(obj_value_list)}'."
+    )
+    log.debug("Values from params: %s, values from response: %s", set(values), set(obj_value_list))
+
+    # Assert 'total' matches the number of objects
+    assert_that(len(obj_value_list)).is_equal_to(int(body["total"])).described_as(
+        f"Expected 'total' in response body ({body['total']}) to match the length of 'objs' ({len(obj_value_list)}).")
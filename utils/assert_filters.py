@@ -1,26 +1,33 @@
 from assertpy import assert_that
 
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
 
 def assert_response_status(resp, expected_status):
     """Asserts that the response status code is as expected."""
-    print(f"Status code: {resp.status_code}")
+    log.info("Status code: %s", resp.status_code)
     assert_that(resp.status_code, f"Expected status code {expected_status}, but got {resp.status_code}").is_equal_to(expected_status)
 
 
 def assert_filter_correctness(body, test_key, expected_value):
     """Asserts that all returned objects have the expected value for the given test_key."""
     objs = body.get('values', [])
-    total = body.get('total', 0)
+    count = 0
 
     for obj in objs:
-        print(f"{test_key}: {obj.get(test_key)}")
+        log.debug("%s: %s", test_key, obj.get(test_key))
         actual_value = int(obj.get(test_key, -1))  # Default to -1 to catch missing keys
         assert_that(actual_value).is_equal_to(int(expected_value)).described_as(
             f"The {test_key} filter is not working correctly.\n"
             f"Expected {test_key}: '{expected_value}', but got '{actual_value}'.")
+        count += 1
 
-    assert_that(len(objs)).is_equal_to(int(total)).described_as(
-        f"Expected 'total' in response body ({total}) to match the length of 'objs' ({len(objs)}).")
+    # Read 'total' after the rows, a streamed body may carry it behind the 'values' array
+    total = body.get('total', 0)
+    assert_that(count).is_equal_to(int(total)).described_as(
+        f"Expected 'total' in response body ({total}) to match the length of 'objs' ({count}).")
 
 
 def assert_gt_filter(body, test_key, expected_value):
@@ -34,7 +41,7 @@ def assert_gt_filter(body, test_key, expected_value):
     objs = body.get('values', [])
 
     for obj in objs:
-        print(f"{test_key}: {int(obj.get(test_key))}")
+        log.debug("%s: %s", test_key, obj.get(test_key))
         assert_that(int(obj.get(test_key))).is_greater_than(int(expected_value))
 
 
@@ -49,7 +56,7 @@ def assert_ge_filter(body, test_key, expected_value):
     objs = body.get('values', [])
 
     for obj in objs:
-        print(f"{test_key}: {int(obj.get(test_key))}")
+        log.debug("%s: %s", test_key, obj.get(test_key))
         assert_that(int(obj.get(test_key))).is_greater_than_or_equal_to(int(expected_value))
 
 
@@ -64,7 +71,7 @@ def assert_lt_filter(body, test_key, expected_value):
     objs = body.get('values', [])
 
     for obj in objs:
-        print(f"{test_key}: {int(obj.get(test_key))}")
+        log.debug("%s: %s", test_key, obj.get(test_key))
         assert_that(int(obj.get(test_key))).is_less_than(int(expected_value))
 
 
@@ -79,7 +86,7 @@ def assert_le_filter(body, test_key, expected_value):
     objs = body.get('values', [])
 
     for obj in objs:
-        print(f"{test_key}: {int(obj.get(test_key))}")
+        log.debug("%s: %s", test_key, obj.get(test_key))
         assert_that(int(obj.get(test_key))).is_less_than_or_equal_to(int(expected_value))
 
 
@@ -95,10 +102,10 @@ def assert_sorted_ascending(body, test_key):
     values = [int(obj[test_key]) for obj in objs]
 
     for i in range(len(values) - 1):
-        print(f"{test_key}: {values[i]}")
+        log.debug("%s: %s", test_key, values[i])
         assert values[i] <= values[i + 1], f"Values for {test_key} are not sorted in ascending order: {values}"
 
-    print(f"All values for {test_key} are sorted in ascending order.")
+    log.debug("All values for %s are sorted in ascending order.", test_key)
 
 
 def assert_sorted_descending(body, test_key):
@@ -113,10 +120,10 @@ def assert_sorted_descending(body, test_key):
     values = [int(obj[test_key]) for obj in objs]
 
     for i in range(len(values) - 1):
-        print(f"{test_key}: {values[i]}")
+        log.debug("%s: %s", test_key, values[i])
         assert values[i] >= values[i + 1], f"Values for {test_key} are not sorted in descending order: {values}"
 
-    print(f"All values for {test_key} are sorted in descending order.")
+    log.debug("All values for %s are sorted in descending order.", test_key)
 
 
 def assert_response_object_count(body, limit):
@@ -129,7 +136,7 @@ def assert_response_object_count(body, limit):
     objs = body['values']
     obj_count = len(objs)
 
-    print(f"Limit: {limit}, Object Count: {obj_count}")
+    log.info("Limit: %s, Object Count: %s", limit, obj_count)
 
     assert_that(obj_count).is_less_than_or_equal_to(limit).described_as(
         f"The number of objects returned in the response "
@@ -156,18 +163,21 @@ def assert_tx_hash_filter(body, expected_value):
         f"Invalid txHash format: {expected_value}. Expected a valid Ethereum transaction hash."
     )
 
+    count = 0
     for obj in objs:
         actual_tx_hash = obj.get('txHash', '')
 
-        print(f"txHash: {actual_tx_hash}")
+        log.debug("txHash: %s", actual_tx_hash)
         assert_that(actual_tx_hash).is_equal_to(expected_value).described_as(
             f"The txHash filter is not working correctly."
             f" Expected txHash: '{expected_value}' in the params, but got txHash: '{actual_tx_hash}'"
             f" in the response objects."
         )
+        count += 1
 
-    assert_that(len(objs)).is_equal_to(int(body.get('total', 0))).described_as(
-        f"Expected 'total' in response body ({body.get('total')}) to match the length of 'objs' ({len(objs)})"
+    total = body.get('total', 0)
+    assert_that(count).is_equal_to(int(total)).described_as(
+        f"Expected 'total' in response body ({total}) to match the length of 'objs' ({count})"
     )
 
 
@@ -191,18 +201,21 @@ def assert_checking_the_eth_address_and_filter(body, test_key, expected_value):
         f"Invalid eth address format: {expected_value}. Expected a valid Ethereum address."
     )
 
+    count = 0
     for obj in objs:
         actual_address = obj.get(test_key, '')
 
-        print(f"{test_key}: {actual_address}")
+        log.debug("%s: %s", test_key, actual_address)
         assert_that(actual_address).is_equal_to(expected_value).described_as(
             f"The {test_key} filter is not working correctly."
             f" Expected {test_key}: '{expected_value}' in the params, but got {test_key}: '{actual_address}'"
             f" in the response objects."
         )
+        count += 1
 
-    assert_that(len(objs)).is_equal_to(int(body.get('total', 0))).described_as(
-        f"Expected 'total' in response body ({body.get('total')}) to match the length of 'objs' ({len(objs)})"
+    total = body.get('total', 0)
+    assert_that(count).is_equal_to(int(total)).described_as(
+        f"Expected 'total' in response body ({total}) to match the length of 'objs' ({count})"
     )
 
 
@@ -218,10 +231,10 @@ def assert_sorted_ascending_with_hexadecimal_values(body, test_key):
     values = [int(obj[test_key], 16) for obj in objs]
 
     for i in range(len(values) - 1):
-        print(f"{test_key}: {values[i]}")
+        log.debug("%s: %s", test_key, values[i])
         assert values[i] <= values[i + 1], f"Values for {test_key} are not sorted in ascending order: {values}"
 
-    print(f"All values for {test_key} are sorted in ascending order.")
+    log.debug("All values for %s are sorted in ascending order.", test_key)
 
 
 def assert_sorted_descending_with_hexadecimal_values(body, test_key):
@@ -236,7 +249,69 @@ def assert_sorted_descending_with_hexadecimal_values(body, test_key):
     values = [int(obj[test_key], 16) for obj in objs]
 
     for i in range(len(values) - 1):
-        print(f"{test_key} as integer: {values[i]}")
+        log.debug("%s as integer: %s", test_key, values[i])
+        assert values[i] >= values[i + 1], f"Values for {test_key} are not sorted in descending order: {values}"
+
+    log.debug("All values for %s are sorted in descending order.", test_key)
+
+
+def assert_value_filter(body, test_key, expected_value):
+    """
+    Validates that all objects in the response have exactly the expected value, e.g. a public key or an IPFS hash.
+
+    param body: The JSON response body.
+    param test_key: The key whose values should be Validated.
+    param expected_value: The expected value pass to params.
+    """
+    objs = body.get('values', [])
+
+    count = 0
+    for obj in objs:
+        actual_value = obj.get(test_key, '')
+
+        log.debug("%s: %s", test_key, actual_value)
+        assert_that(actual_value).is_equal_to(expected_value).described_as(
+            f"The {test_key} filter is not working correctly."
+            f" Expected {test_key}: '{expected_value}' in the params, but got {test_key}: '{actual_value}'"
+            f" in the response objects."
+        )
+        count += 1
+
+    total = body.get('total', 0)
+    assert_that(count).is_equal_to(int(total)).described_as(
+        f"Expected 'total' in response body ({total}) to match the length of 'objs' ({count})"
+    )
+
+
+def assert_sorted_ascending_with_string_values(body, test_key):
+    """
+    Validate that the specified key in the response body is sorted in ascending order of its string values.
+
+    param body: The JSON response body.
+    param test_key: The key whose values should be sorted.
+    """
+    objs = body['values']
+    values = [obj[test_key] for obj in objs]
+
+    for i in range(len(values) - 1):
+        log.debug("%s: %s", test_key, values[i])
+        assert values[i] <= values[i + 1], f"Values for {test_key} are not sorted in ascending order: {values}"
+
+    log.debug("All values for %s are sorted in ascending order.", test_key)
+
+
+def assert_sorted_descending_with_string_values(body, test_key):
+    """
+    Validate that the specified key in the response body is sorted in descending order of its string values.
+
+    param body: The JSON response body.
+    param test_key: The key whose values should be sorted.
+    """
+    objs = body['values']
+    values = [obj[test_key] for obj in objs]
+
+    for i in range(len(values) - 1):
+        log.debug("%s: %s", test_key, values[i])
         assert values[i] >= values[i + 1], f"Values for {test_key} are not sorted in descending order: {values}"
-    for elem in objs:
-        print(f"All values for {elem[test_key]} are sorted in descending order.")
+
+    log.debug("All values for %s are sorted in descending order.", test_key)
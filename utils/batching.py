@@ -0,0 +1,135 @@
+import threading
+from collections import namedtuple
+from urllib.parse import unquote
+
+from utils.events import EVENTS, NUMERIC_KINDS, event_from_url
+from utils.query import param_shape, split_params
+
+_IN_SUFFIX = "FilterIn"
+
+_enabled = False
+_lock = threading.Lock()
+_stats = {"batches": 0, "queries": 0, "fallbacks": 0}
+
+# A FilterIn query standing in for several pending queries on one endpoint and field
+Batch = namedtuple("Batch", "url field limit params members")
+# One of the original queries of a batch and the field values it asked for
+Member = namedtuple("Member", "params values")
+
+
+def configure_batching(enabled=False):
+    """
+    Enable or disable merging the prefetched equality and FilterIn checks of one field into one FilterIn query.
+    """
+    global _enabled
+    _enabled = enabled
+
+
+def is_enabled():
+    return _enabled
+
+
+def plan(url, queries):
+    """
+    Group the queries of one endpoint that only filter one field for equality or membership and set a limit.
+
+    Queries with the same field and limit are merged into one '<field>FilterIn=<all values>&limit=<limit>'
+    query when there are at least two of them; everything else is left as it is.
+
+    param url: The endpoint URL the queries were discovered for.
+    param queries: (url, params) pairs, as returned by utils.prefetch.discover_queries.
+
+    Returns:
+        tuple: (list of Batch, list of the (url, params) pairs not batched)
+    """
+    fields = EVENTS.get(event_from_url(url), {})
+    groups = {}
+    rest = []
+    for query_url, params in queries:
+        check = _membership_check(params, fields) if query_url == url else None
+        if check is None:
+            rest.append((query_url, params))
+        else:
+            field, limit, values = check
+            groups.setdefault((field, limit), {}).setdefault(tuple(params), Member(list(params), values))
+
+    batches = []
+    for (field, limit), members in groups.items():
+        members = list(members.values())
+        if len(members) < 2:
+            rest.extend((url, member.params) for member in members)
+            continue
+        values = sorted({value for member in members for value in member.values})
+        params = [f"{field}{_IN_SUFFIX}={','.join(values)}", f"limit={limit}"]
+        batches.append(Batch(url, field, limit, params, members))
+    return batches, rest
+
+
+def _membership_check(params, fields):
+    """Returns (field, limit, encoded values) for a query of exactly one eq or FilterIn piece and a limit."""
+    field = values = limit = None
+    for piece in split_params(params):
+        name, _, value = piece.partition("=")
+        shape = param_shape(name)
+        if name == "limit" and limit is None and value.isdigit():
+            limit = int(value)
+        elif shape in ("eq", "in") and field is None:
+            field = name[:-len(_IN_SUFFIX)] if shape == "in" else name
+            values = value.split(",") if shape == "in" else [value]
+        else:
+            return None
+    if field not in fields or limit is None or not all(values):
+        return None
+    return field, limit, values
+
+
+def split(batch, member, result):
+    """
+    Cut the answer of one member out of the batch's merged result.
+
+    The rows are selected locally by the member's field values and 'total' becomes the number of rows
+    selected, so a member's total check no longer tests the server's count.
+
+    param result: [resp, body] of the batch's FilterIn query.
+
+    Returns:
+        list: [resp, body] for the member, or None when the merged result cannot stand in for it: it is not
+        a 200, or it reached the limit and may be missing rows of the member.
+    """
+    resp, body = result
+    if resp.status_code != 200:
+        return None
+    rows = body.get("values")
+    if not isinstance(rows, list) or len(rows) >= batch.limit:
+        return None
+
+    kind = EVENTS[event_from_url(batch.url)][batch.field]
+    wanted = {_normalize(unquote(value), kind) for value in member.values}
+    selected = [row for row in rows if _normalize(row.get(batch.field), kind) in wanted]
+    return [resp, {"values": selected, "total": len(selected)}]
+
+
+def _normalize(value, kind):
+    if value is None:
+        return None
+    if kind in NUMERIC_KINDS:
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return value
+    # Hex values may differ in case only
+    return str(value).lower()
+
+
+def account(batch, fallbacks):
+    """Count one answered batch and how many of its members had to be sent on their own."""
+    with _lock:
+        _stats["batches"] += 1
+        _stats["queries"] += len(batch.members)
+        _stats["fallbacks"] += fallbacks
+
+
+def batching_stats():
+    """Returns {'batches', 'queries', 'fallbacks'}: FilterIn queries sent, queries they stood in for, fallbacks."""
+    with _lock:
+        return dict(_stats)
@@ -0,0 +1,159 @@
+import threading
+import time
+
+import requests
+
+from utils.deadline import DeadlineExceeded
+
+# Consecutive failures that open an endpoint's circuit
+DEFAULT_BREAKER_THRESHOLD = 5
+# Seconds an open circuit fails queries fast before a probe is let through
+DEFAULT_BREAKER_RESET = 30.0
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised by fetch_get for a query to an endpoint whose circuit is open."""
+
+
+def is_failure_status(status_code):
+    """5xx responses mean the endpoint is unhealthy; 429 is left to congestion control."""
+    return status_code >= 500
+
+
+class _Circuit:
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.last_error = None
+        self.probing = False
+        self.trips = 0
+        self.fast_failed = 0
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint circuit breaker.
+
+    After threshold consecutive failures (transport errors, timeouts, 5xx) an endpoint's circuit opens and its
+    queries fail fast with CircuitOpenError. Once reset_timeout has passed a single probe query is let through
+    (half-open): success closes the circuit, failure opens it for another reset_timeout. Queries cut off at the
+    running test's deadline raise DeadlineExceeded, timeouts cut down to what was left of its budget included,
+    and are not failures.
+
+    param threshold: Consecutive failures that open a circuit.
+    param reset_timeout: Seconds before an open circuit lets a probe through.
+    """
+
+    def __init__(self, threshold=DEFAULT_BREAKER_THRESHOLD, reset_timeout=DEFAULT_BREAKER_RESET):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._circuits = {}
+
+    def call(self, endpoint, fn):
+        """
+        Run fn (which returns a response) unless the endpoint's circuit is open.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with its probe still in flight.
+        """
+        probe = self._admit(endpoint)
+        try:
+            resp = fn()
+        except DeadlineExceeded:
+            # Cut off at the test's deadline, which says nothing about the endpoint's health
+            self._release(endpoint, probe)
+            raise
+        except (requests.ConnectionError, requests.Timeout) as e:
+            self._failed(endpoint, probe, f"{type(e).__name__}: {e}")
+            raise
+        except BaseException:
+            self._release(endpoint, probe)
+            raise
+
+        if is_failure_status(resp.status_code):
+            self._failed(endpoint, probe, f"HTTP {resp.status_code}")
+        else:
+            self._succeeded(endpoint)
+        return resp
+
+    def _admit(self, endpoint):
+        with self._lock:
+            circuit = self._circuits.setdefault(endpoint, _Circuit())
+            if circuit.state == CLOSED:
+                return False
+
+            waited = time.monotonic() - circuit.opened_at
+            if circuit.state == OPEN and waited >= self.reset_timeout:
+                circuit.state = HALF_OPEN
+            if circuit.state == HALF_OPEN and not circuit.probing:
+                circuit.probing = True
+                return True
+
+            circuit.fast_failed += 1
+            retry = max(self.reset_timeout - waited, 0.0)
+            raise CircuitOpenError(
+                f"{endpoint} is unavailable: circuit opened after {circuit.failures} consecutive failures "
+                f"(last: {circuit.last_error}); next probe in {retry:.0f}s")
+
+    def _failed(self, endpoint, probe, reason):
+        with self._lock:
+            circuit = self._circuits[endpoint]
+            circuit.failures += 1
+            circuit.last_error = reason
+            if probe:
+                circuit.probing = False
+            if probe or (circuit.state == CLOSED and circuit.failures >= self.threshold):
+                circuit.state = OPEN
+                circuit.opened_at = time.monotonic()
+                circuit.trips += 1
+
+    def _succeeded(self, endpoint):
+        with self._lock:
+            circuit = self._circuits[endpoint]
+            circuit.state = CLOSED
+            circuit.failures = 0
+            circuit.probing = False
+
+    def _release(self, endpoint, probe):
+        if probe:
+            with self._lock:
+                self._circuits[endpoint].probing = False
+
+    def stats(self):
+        """Returns endpoint -> {'state', 'trips', 'fast_failed', 'last_error'} for endpoints that ever tripped."""
+        with self._lock:
+            return {endpoint: {"state": circuit.state, "trips": circuit.trips, "fast_failed": circuit.fast_failed,
+                               "last_error": circuit.last_error}
+                    for endpoint, circuit in self._circuits.items() if circuit.trips}
+
+
+_breaker = CircuitBreaker()
+
+
+def configure_breaker(enabled=True, threshold=DEFAULT_BREAKER_THRESHOLD, reset_timeout=DEFAULT_BREAKER_RESET):
+    """
+    Enable or disable the per-endpoint circuit breaker under fetch_get.
+
+    param threshold: Consecutive failures that open an endpoint's circuit.
+    param reset_timeout: Seconds an open circuit fails fast before it lets a probe through.
+    """
+    global _breaker
+    _breaker = CircuitBreaker(threshold=threshold, reset_timeout=reset_timeout) if enabled else None
+
+
+def call(endpoint, fn):
+    """Runs fn under the endpoint's circuit when the breaker is enabled."""
+    if _breaker is None:
+        return fn()
+    return _breaker.call(endpoint, fn)
+
+
+def breaker_stats():
+    """Returns endpoint -> {'state', 'trips', 'fast_failed', 'last_error'}, empty while the breaker is off."""
+    return _breaker.stats() if _breaker is not None else {}
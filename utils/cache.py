@@ -0,0 +1,106 @@
+import threading
+import time
+from collections import OrderedDict
+
+# Upper bound for the summed body sizes kept in the cache
+DEFAULT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+# Seconds a cached response stays valid
+DEFAULT_CACHE_TTL = 300.0
+
+
+class ResponseCache:
+    """
+    In-memory cache of decoded responses, evicted least-recently-used first once max_bytes is exceeded.
+
+    param max_bytes: Upper bound for the summed body sizes of the cached responses.
+    param ttl: Seconds an entry stays valid; expired entries count as misses.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_MAX_BYTES, ttl=DEFAULT_CACHE_TTL):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size = 0
+        self._entries = OrderedDict()
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, endpoint):
+        """Returns the cached value for key or None, counting a hit or a miss for the endpoint."""
+        with self._lock:
+            stats = self._endpoint_stats(endpoint)
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                self._drop(key)
+                entry = None
+            if entry is None:
+                stats["misses"] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            stats["hits"] += 1
+            stats["bytes_saved"] += entry[1]
+            return entry[2]
+
+    def put(self, key, value, size):
+        """Stores value under key, evicting least recently used entries until it fits."""
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + self.ttl, size, value)
+            self.size += size
+            while self.size > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self):
+        """Returns endpoint -> {'hits', 'misses', 'bytes_saved'}."""
+        with self._lock:
+            return {endpoint: dict(stats) for endpoint, stats in self._stats.items()}
+
+    def _drop(self, key):
+        _, size, _ = self._entries.pop(key)
+        self.size -= size
+
+    def _endpoint_stats(self, endpoint):
+        return self._stats.setdefault(endpoint, {"hits": 0, "misses": 0, "bytes_saved": 0})
+
+
+_cache = ResponseCache()
+_enabled = True
+
+
+def configure_cache(enabled=True, max_bytes=DEFAULT_CACHE_MAX_BYTES, ttl=DEFAULT_CACHE_TTL):
+    """
+    Replace the response cache used under fetch_get.
+
+    param enabled: Set to False to send every query to the indexer.
+    param max_bytes: Upper bound for the summed body sizes of the cached responses.
+    param ttl: Seconds a cached response stays valid.
+    """
+    global _cache, _enabled
+    _cache = ResponseCache(max_bytes=max_bytes, ttl=ttl)
+    _enabled = enabled
+
+
+def lookup(key, endpoint):
+    """Returns the cached [resp, body] for a query key, or None."""
+    if not _enabled:
+        return None
+    return _cache.get(key, endpoint)
+
+
+def store(key, value, size):
+    """Caches [resp, body] for a query key; size is the body size in bytes."""
+    if _enabled:
+        _cache.put(key, value, size)
+
+
+def cache_stats():
+    """Returns endpoint -> {'hits', 'misses', 'bytes_saved'} for the active cache."""
+    return _cache.stats() if _enabled else {}
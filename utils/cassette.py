@@ -0,0 +1,144 @@
+import json
+import os
+import random
+import threading
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from utils.store import ContentStore
+from utils.wire import stored_headers
+
+DEFAULT_CASSETTE_DIR = "cassettes"
+
+
+class CassetteMiss(LookupError):
+    """Raised in replay mode for a query that was not recorded."""
+
+
+class Cassette:
+    """
+    Recorded indexer responses: an append-only index.jsonl pointing at bodies in a ContentStore.
+
+    The whole index is loaded into a dict on open, so a replayed lookup is a single dict access.
+
+    param root: Directory holding index.jsonl, meta.json and the objects store.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.store = ContentStore(root)
+        self.index = {}
+        self.seed = None
+        self._lock = threading.Lock()
+
+        meta_path = os.path.join(root, "meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                self.seed = json.load(f).get("seed")
+
+        index_path = os.path.join(root, "index.jsonl")
+        if os.path.exists(index_path):
+            with open(index_path) as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.index[entry["key"]] = entry
+
+    def start_recording(self):
+        """Begin a new recording: pick a fresh random seed and drop the previous index."""
+        os.makedirs(self.root, exist_ok=True)
+        self.seed = random.randrange(2 ** 32)
+        self.index = {}
+        with open(os.path.join(self.root, "meta.json"), "w") as f:
+            json.dump({"seed": self.seed}, f)
+        open(os.path.join(self.root, "index.jsonl"), "w").close()
+
+    def record(self, key, resp):
+        """Store a response under a query key."""
+        entry = {
+            "key": key,
+            "url": resp.url,
+            "status": resp.status_code,
+            "reason": resp.reason,
+            "headers": stored_headers(resp.headers),
+            "body": self.store.put(resp.content),
+        }
+        with self._lock:
+            self.index[key] = entry
+            with open(os.path.join(self.root, "index.jsonl"), "a") as f:
+                f.write(json.dumps(entry) + "\n")
+
+    def replay(self, key):
+        """
+        Rebuild the recorded response for a query key.
+
+        Raises:
+            CassetteMiss: If the query was not recorded.
+        """
+        entry = self.index.get(key)
+        if entry is None:
+            raise CassetteMiss(f"Query was not recorded in {self.root}: {key}")
+
+        resp = requests.Response()
+        resp.status_code = entry["status"]
+        resp.reason = entry["reason"]
+        resp.url = entry["url"]
+        resp.headers = CaseInsensitiveDict(entry["headers"])
+        resp.encoding = get_encoding_from_headers(resp.headers)
+        resp._content = self.store.get(entry["body"])
+        return resp
+
+
+_cassette = None
+_mode = None
+
+
+def configure_cassette(mode=None, root=DEFAULT_CASSETTE_DIR):
+    """
+    Select the record/replay mode of fetch_get.
+
+    param mode: None to talk to the indexer, 'record' to talk to it and store every response,
+        'replay' to answer every query from the store without touching the network.
+    param root: Directory of the cassette.
+    """
+    global _cassette, _mode
+    _mode = mode
+    _cassette = Cassette(root) if mode else None
+    if mode == "record":
+        _cassette.start_recording()
+
+
+def is_active():
+    return _mode is not None
+
+
+def is_replaying():
+    return _mode == "replay"
+
+
+def is_recording():
+    return _mode == "record"
+
+
+def replay(key):
+    return _cassette.replay(key)
+
+
+def record(key, resp):
+    _cassette.record(key, resp)
+
+
+def seed_for(test_id):
+    """
+    Random seed for one test while recording or replaying, so it draws the same sample both times.
+
+    param test_id: Stable identifier of the test.
+
+    Returns:
+        str: The seed, or None outside of record/replay mode.
+    """
+    if _cassette is None or _cassette.seed is None:
+        return None
+    return f"{_cassette.seed}:{test_id}"
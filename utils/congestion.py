@@ -0,0 +1,161 @@
+import threading
+import time
+
+DEFAULT_AIMD_INITIAL = 4
+DEFAULT_AIMD_MAX = 64
+# Multiplicative decrease applied on congestion
+AIMD_DECREASE = 0.5
+# A latency above this multiple of the smoothed latency of its kind of request counts as a spike
+AIMD_LATENCY_SPIKE = 3.0
+# Weight of the newest latency in a smoothed latency
+_EWMA_ALPHA = 0.1
+# Latencies a smoothed latency needs before it is trusted to tell spikes
+_SPIKE_MIN_SAMPLES = 10
+
+
+def is_congestion_status(status_code):
+    """429 and 5xx responses tell the client to back off."""
+    return status_code == 429 or status_code >= 500
+
+
+class AIMDController:
+    """
+    Client-side congestion control for concurrent requests.
+
+    The in-flight limit grows by one per limit's worth of healthy responses (additive increase) and is halved
+    on 429/5xx responses, errors or latency spikes (multiplicative decrease), at most once per smoothed round trip.
+    Latency is smoothed per kind of request, e.g. (endpoint, query shape): a full page taking longer than a count
+    query is not a spike. A kind's first few latencies are too noisy to tell spikes, so they only build its
+    smoothed latency.
+
+    param initial: Starting in-flight limit.
+    param maximum: Upper bound of the in-flight limit.
+    param minimum: Lower bound of the in-flight limit.
+    """
+
+    def __init__(self, initial=DEFAULT_AIMD_INITIAL, maximum=DEFAULT_AIMD_MAX, minimum=1):
+        self.limit = float(initial)
+        self.maximum = maximum
+        self.minimum = minimum
+        self.in_flight = 0
+        self.decreases = 0
+        self._smoothed = {}
+        self._last_decrease = 0.0
+        self._start = time.monotonic()
+        self._cond = threading.Condition()
+        self.trajectory = [(0.0, int(self.limit), "start")]
+
+    def acquire(self):
+        """Blocks until a request may be sent."""
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+
+    def try_acquire(self):
+        """Returns whether a request may be sent right away, taking its slot if so."""
+        with self._cond:
+            if self.in_flight >= int(self.limit):
+                return False
+            self.in_flight += 1
+            return True
+
+    def smoothed_latency(self, key=None):
+        """Returns the smoothed latency of a kind of request in seconds, or None before its first response."""
+        with self._cond:
+            return self._smoothed.get(key, (None, 0))[0]
+
+    def release(self, latency, congested, key=None):
+        """
+        Report a finished request and adjust the limit.
+
+        param latency: Seconds the request took.
+        param congested: True for 429/5xx responses and transport errors.
+        param key: Kind of request whose smoothed latency it is compared with and added to.
+        """
+        with self._cond:
+            self.in_flight -= 1
+            now = time.monotonic()
+            smoothed, samples = self._smoothed.get(key, (None, 0))
+            spike = samples >= _SPIKE_MIN_SAMPLES and latency > AIMD_LATENCY_SPIKE * smoothed
+
+            if congested or spike:
+                if now - self._last_decrease > (smoothed or 0.0):
+                    self._set_limit(max(self.minimum, self.limit * AIMD_DECREASE), now,
+                                    "congestion" if congested else "latency spike")
+                    self._last_decrease = now
+                    self.decreases += 1
+            else:
+                self._set_limit(min(self.maximum, self.limit + 1.0 / self.limit), now, "increase")
+
+            if not congested:
+                self._smoothed[key] = (latency if smoothed is None else (
+                    (1 - _EWMA_ALPHA) * smoothed + _EWMA_ALPHA * latency), samples + 1)
+            self._cond.notify_all()
+
+    def _set_limit(self, limit, now, reason):
+        changed = int(limit) != int(self.limit)
+        self.limit = limit
+        if changed:
+            self.trajectory.append((now - self._start, int(limit), reason))
+
+
+_controller = None
+
+
+def configure_congestion(enabled=False, initial=DEFAULT_AIMD_INITIAL, maximum=DEFAULT_AIMD_MAX):
+    """
+    Enable or disable the AIMD controller in front of the requests fetch_get sends.
+
+    param initial: Starting in-flight limit.
+    param maximum: Upper bound of the in-flight limit.
+    """
+    global _controller
+    _controller = AIMDController(initial=initial, maximum=maximum) if enabled else None
+
+
+def call(fn, key=None):
+    """
+    Runs fn (which returns a response) under the controller when it is enabled.
+
+    param key: Kind of request its latency is smoothed with, e.g. (endpoint, query shape).
+    """
+    controller = _controller
+    if controller is None:
+        return fn()
+
+    controller.acquire()
+    return _run(controller, fn, key)
+
+
+def reserve(key=None):
+    """
+    Take an in-flight slot without waiting, for an extra copy of a request such as a hedge.
+
+    Returns:
+        callable: Runs the copy's callable in the slot, like call; None when the controller is at its limit,
+        the copy is then not sent.
+    """
+    controller = _controller
+    if controller is None:
+        return lambda fn: fn()
+    if not controller.try_acquire():
+        return None
+    return lambda fn: _run(controller, fn, key)
+
+
+def _run(controller, fn, key):
+    # Called with a slot of controller taken
+    start = time.perf_counter()
+    congested = True
+    try:
+        resp = fn()
+        congested = is_congestion_status(resp.status_code)
+        return resp
+    finally:
+        controller.release(time.perf_counter() - start, congested, key)
+
+
+def controller():
+    """Returns the active AIMDController, or None."""
+    return _controller
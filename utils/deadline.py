@@ -0,0 +1,276 @@
+import heapq
+import itertools
+import socket
+import threading
+import time
+from contextlib import contextmanager
+
+import requests
+
+# Seconds to wait for a connection to the indexer
+DEFAULT_CONNECT_TIMEOUT = 10.0
+# Seconds to wait between two bytes of a response
+DEFAULT_READ_TIMEOUT = 120.0
+
+_connect_timeout = DEFAULT_CONNECT_TIMEOUT
+_read_timeout = DEFAULT_READ_TIMEOUT
+_budget = None
+_started = None
+_deadline = None
+# The guard of the request the current thread sends, see enforce
+_local = threading.local()
+
+
+class DeadlineExceeded(requests.Timeout):
+    """Raised by fetch_get once the running test has used up its time budget."""
+
+
+class _Guard:
+    """The connections of one request, shut down by the watchdog once the request's deadline has passed."""
+
+    def __init__(self, expires):
+        self.expires = expires
+        self.fired = False
+        self.finished = False
+        self._lock = threading.Lock()
+        self._connections = []
+
+    def watch(self, connection):
+        with self._lock:
+            if not self.fired:
+                self._connections.append(connection)
+                return
+        _shut_down(connection)
+
+    def fire(self):
+        with self._lock:
+            if self.finished:
+                return
+            self.fired = True
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            _shut_down(connection)
+
+    def finish(self):
+        with self._lock:
+            self.finished = True
+            self._connections = []
+
+
+def _shut_down(connection):
+    # Wakes up a thread blocked reading from the socket, which then fails with a connection error
+    sock = getattr(connection, "sock", None)
+    if sock is not None:
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
+class _Watchdog:
+    """One thread firing the guards whose deadline has passed, in deadline order."""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._guards = []
+        self._order = itertools.count()
+        self._thread = None
+
+    def add(self, guard):
+        with self._condition:
+            heapq.heappush(self._guards, (guard.expires, next(self._order), guard))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="deadline-watchdog", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._guards and self._guards[0][2].finished:
+                    heapq.heappop(self._guards)
+                if not self._guards:
+                    self._condition.wait()
+                    continue
+                wait = self._guards[0][0] - time.monotonic()
+                if wait > 0:
+                    self._condition.wait(wait)
+                    continue
+                guard = heapq.heappop(self._guards)[2]
+            guard.fire()
+
+
+_watchdog = _Watchdog()
+
+
+def configure_deadlines(connect_timeout=DEFAULT_CONNECT_TIMEOUT, read_timeout=DEFAULT_READ_TIMEOUT, budget=None):
+    """
+    Set the request timeouts and the per-test time budget.
+
+    param connect_timeout: Seconds to wait for a connection.
+    param read_timeout: Seconds to wait between two bytes of a response.
+    param budget: Seconds a test may take, setup and teardown included; None for no budget.
+    """
+    global _connect_timeout, _read_timeout, _budget
+    _connect_timeout = connect_timeout
+    _read_timeout = read_timeout
+    _budget = budget
+
+
+def start_test():
+    """Start the budget of the test about to run."""
+    global _started, _deadline
+    _started = time.monotonic()
+    _deadline = _started + _budget if _budget is not None else None
+
+
+def end_test():
+    global _started, _deadline
+    _started = _deadline = None
+
+
+def elapsed():
+    """Returns the seconds since the running test started, or None outside of a test."""
+    return time.monotonic() - _started if _started is not None else None
+
+
+def over_budget():
+    """Whether the running test has taken longer than its budget."""
+    return _deadline is not None and time.monotonic() > _deadline
+
+
+def budget():
+    """Returns the per-test budget in seconds, or None."""
+    return _budget
+
+
+def remaining():
+    """Returns the seconds left in the running test's budget, or None without a budget."""
+    if _deadline is None:
+        return None
+    return _deadline - time.monotonic()
+
+
+def expiry():
+    """Returns the monotonic time the running test's budget runs out at, or None without a budget."""
+    return _deadline
+
+
+def request_timeout():
+    """
+    Returns the (connect, read) timeout for the next request, cut down to what is left of the test's budget.
+
+    Raises:
+        DeadlineExceeded: If the budget is used up.
+    """
+    left = remaining()
+    if left is None:
+        return _connect_timeout, _read_timeout
+    if left <= 0:
+        raise DeadlineExceeded(f"The test's budget of {_budget:g}s is used up")
+    return min(_connect_timeout, left), min(_read_timeout, left)
+
+
+@contextmanager
+def enforce(expires):
+    """
+    Cut off the request sent in the block at a wall-clock deadline.
+
+    Socket timeouts only bound the wait for each read, so a response trickling in keeps a request alive past
+    them. The connections the current thread reads a response from in the block (see watch_connection) are
+    shut down once expires has passed, and a request failing past expires raises DeadlineExceeded, which tells
+    a cut-off apart from a slow or failing endpoint.
+
+    param expires: Monotonic time, e.g. expiry(); None enforces nothing.
+    """
+    if expires is None:
+        yield
+        return
+    guard = _Guard(expires)
+    _watchdog.add(guard)
+    previous, _local.guard = getattr(_local, "guard", None), guard
+    try:
+        yield
+        # A body without a length ends quietly when its connection is shut down
+        if guard.fired:
+            raise DeadlineExceeded("The request was cut off at the test's deadline")
+    except DeadlineExceeded:
+        raise
+    except requests.RequestException as e:
+        if passed(expires):
+            raise DeadlineExceeded("The request was cut off at the test's deadline") from e
+        raise
+    finally:
+        _local.guard = previous
+        guard.finish()
+
+
+def watch_connection(connection):
+    """Called by the client's connections before a response is read: cut it off with the request, see enforce."""
+    guard = getattr(_local, "guard", None)
+    if guard is not None:
+        guard.watch(connection)
+
+
+def cut_off(expires, connection):
+    """
+    Shut down a connection at expires, for a body read after the block of enforce, e.g. a stream.
+
+    Returns:
+        The guard to release() once the body was read, or None when there is nothing to cut off.
+    """
+    if expires is None or connection is None:
+        return None
+    guard = _Guard(expires)
+    guard.watch(connection)
+    _watchdog.add(guard)
+    return guard
+
+
+def was_cut_off(guard):
+    """Whether the connection of a guard of cut_off was shut down; a body read from it may be truncated."""
+    return guard is not None and guard.fired
+
+
+def release(guard):
+    """Stop a guard of cut_off before its connection goes back to the pool."""
+    if guard is not None:
+        guard.finish()
+
+
+def passed(expires):
+    """Whether a deadline of enforce or cut_off has passed; a request failing then was cut off."""
+    return expires is not None and time.monotonic() >= expires
+
+
+def default_timeout():
+    """Returns the configured (connect, read) timeout, for requests outside of a test's budget."""
+    return _connect_timeout, _read_timeout
+
+
+def breakdown(properties, elapsed):
+    """
+    Describe where the time of a test went, from the requests utils.timing attached to it.
+
+    param properties: The test's user_properties.
+    param elapsed: Seconds the test took.
+
+    Returns:
+        str: Time per request phase, the test's own time and its slowest requests.
+    """
+    from utils.timing import PHASES
+
+    sent = [entry for name, entry in properties if name == "indexer_request"]
+    decodes = [entry for name, entry in properties if name == "indexer_decode"]
+    phases = {phase: sum(entry[phase] for entry in sent) for phase in PHASES}
+    phases["decode"] += sum(entry["decode"] for entry in decodes)
+    spent = sum(phases.values())
+
+    lines = [f"{elapsed:.2f}s against a budget of {_budget:g}s, {len(sent)} requests"]
+    lines += [f"  {phase:<10} {seconds:8.3f}s" for phase, seconds in phases.items()]
+    lines.append(f"  {'other':<10} {max(elapsed - spent, 0.0):8.3f}s (test code, assertions, waiting)")
+    slowest = sorted(sent, key=lambda entry: entry["total"], reverse=True)[:5]
+    if slowest:
+        lines.append("slowest requests:")
+        lines += [f"  {entry['total']:8.3f}s  {entry['url']}" for entry in slowest]
+    return "\n".join(lines)
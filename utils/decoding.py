@@ -0,0 +1,183 @@
+import json
+import re
+import time
+from collections.abc import Mapping
+from typing import TypedDict
+
+from utils.events import EVENTS, NUMERIC_KINDS
+
+# Faster JSON backends are optional: `pip install msgspec` or `pip install orjson`
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Installed backends, fastest first, as measured by benchmarks/bench_decoders.py on recorded bodies: orjson
+# decodes plain bodies ~10% faster than msgspec, msgspec typed rows ~2x faster than orjson plus conversion
+AVAILABLE_BACKENDS = [name for name, module in (("orjson", orjson), ("msgspec", msgspec)) if module] + ["json"]
+_TYPED_BACKENDS = [name for name, module in (("msgspec", msgspec), ("orjson", orjson)) if module] + ["json"]
+
+# A top-level "total" written first or last in the body, so it can be read without decoding the rows
+_LEADING_TOTAL = re.compile(rb'\A\s*\{\s*"total"\s*:\s*(-?\d+)\s*[,}]')
+_TRAILING_TOTAL = re.compile(rb'"total"\s*:\s*(-?\d+)\s*\}\s*\Z')
+# Bytes at the end of the body searched for a trailing "total"
+_TAIL_BYTES = 64
+
+_backend = AVAILABLE_BACKENDS[0]
+_typed = False
+_typed_decoders = {}
+
+
+def configure_decoder(backend=None, typed=False):
+    """
+    Select the JSON backend used to decode response bodies.
+
+    param backend: 'msgspec', 'orjson' or 'json'; None picks the fastest installed one for the typed mode.
+    param typed: Decode the rows of registered events with their numeric fields already converted to int.
+
+    Raises:
+        ValueError: If the requested backend is not installed.
+    """
+    global _backend, _typed
+    backend = backend or (_TYPED_BACKENDS if typed else AVAILABLE_BACKENDS)[0]
+    if backend not in AVAILABLE_BACKENDS:
+        raise ValueError(f"JSON backend '{backend}' is not installed, available: {', '.join(AVAILABLE_BACKENDS)}")
+    _backend = backend
+    _typed = typed
+
+
+def decode_body(content, event=None, backend=None, typed=None):
+    """
+    Decode a response body.
+
+    param content: The raw body bytes.
+    param event: Event name of the endpoint, see utils.events.event_from_url.
+    param backend: Overrides the configured backend.
+    param typed: Overrides the configured typed mode; it only applies to registered events.
+
+    Raises:
+        ValueError: If the body is not valid JSON.
+    """
+    backend = backend or _backend
+    typed = _typed if typed is None else typed
+    if typed and event in EVENTS:
+        return _decode_typed(content, event, backend)
+    return _loads(content, backend)
+
+
+class LazyBody(Mapping):
+    """
+    Response body that is decoded on first access.
+
+    'total' is read straight from the raw bytes when the body has it as its first or last member, so
+    count-only checks never decode the rows. A body that is not valid JSON reads as an empty dict.
+
+    param content: The raw body bytes.
+    param event: Event name of the endpoint, see decode_body.
+    param on_decode: Called with the seconds the decode took, once it happened.
+    """
+
+    def __init__(self, content, event=None, on_decode=None):
+        self.content = content
+        self.event = event
+        self._on_decode = on_decode
+        self._data = None
+
+    @property
+    def decoded(self):
+        """Whether the body has been decoded."""
+        return self._data is not None
+
+    def __getitem__(self, key):
+        if key == "total" and self._data is None:
+            total = fast_total(self.content)
+            if total is not None:
+                return total
+        return self._decode()[key]
+
+    def __iter__(self):
+        return iter(self._decode())
+
+    def __len__(self):
+        return len(self._decode())
+
+    def __repr__(self):
+        return repr(self._data) if self._data is not None else f"<LazyBody {len(self.content)} bytes>"
+
+    def _decode(self):
+        if self._data is None:
+            start = time.perf_counter()
+            try:
+                data = decode_body(self.content, self.event)
+            except ValueError:
+                data = {}
+            if not isinstance(data, dict):
+                data = {}
+            self._data = data
+            if self._on_decode is not None:
+                self._on_decode(time.perf_counter() - start)
+        return self._data
+
+
+def fast_total(content):
+    """
+    Read the top-level 'total' of a body without decoding it.
+
+    Returns:
+        int: The total, or None when it is not the first or last member of the body.
+    """
+    match = _LEADING_TOTAL.match(content) or _TRAILING_TOTAL.search(content, max(len(content) - _TAIL_BYTES, 0))
+    return int(match.group(1)) if match is not None else None
+
+
+def _loads(content, backend):
+    if backend == "msgspec":
+        try:
+            return msgspec.json.decode(content)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+    if backend == "orjson":
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def _decode_typed(content, event, backend):
+    if backend == "msgspec":
+        try:
+            return _typed_decoder(event).decode(content)
+        except msgspec.ValidationError:
+            # Unexpected field types: keep the rows as they came
+            return _loads(content, backend)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+    body = _loads(content, backend)
+    numeric = [name for name, kind in EVENTS[event].items() if kind in NUMERIC_KINDS]
+    try:
+        for row in body.get("values", []):
+            for name in numeric:
+                if row.get(name) is not None:
+                    row[name] = int(row[name])
+    except (AttributeError, TypeError, ValueError):
+        body = _loads(content, backend)
+    return body
+
+
+def _typed_decoder(event):
+    """
+    msgspec decoder for one event: rows become dicts typed per the registry, converted in C.
+
+    Only registered fields are kept in the rows.
+    """
+    decoder = _typed_decoders.get(event)
+    if decoder is None:
+        fields = {name: int if kind in NUMERIC_KINDS else str for name, kind in EVENTS[event].items()}
+        row_type = TypedDict(event, fields, total=False)
+        body_type = TypedDict(f"{event}Body", {"values": list[row_type], "total": int}, total=False)
+        decoder = _typed_decoders[event] = msgspec.json.Decoder(body_type, strict=False)
+    return decoder
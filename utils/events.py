@@ -0,0 +1,157 @@
+import re
+
+from routes.indexer_endpoints import BASE_URL
+
+# Field kinds of the indexed events
+INT = "int"                # block numbers, timestamps, log indexes
+UINT256 = "uint256"        # on-chain integers serialized as decimal strings
+ADDRESS = "address"        # 0x-prefixed 20-byte hex
+TX_HASH = "tx_hash"        # 0x-prefixed 32-byte hex
+PUBLIC_KEY = "public_key"  # 0x-prefixed 48-byte validator public key
+IPFS_HASH = "ipfs_hash"    # IPFS content identifier
+
+# Kinds holding integers, converted to int by the typed decoder
+NUMERIC_KINDS = (INT, UINT256)
+
+# Checks of a field: equality, FilterIn, the four range filters and the two sort orders
+EQ, IN, GT, GE, LT, LE, ASC, DESC = "eq", "in", "gt", "ge", "lt", "le", "asc", "desc"
+RANGES = (GT, GE, LT, LE)
+ORDERS = (ASC, DESC)
+
+# Checks a field gets by its kind
+KIND_CHECKS = {
+    INT: (EQ, IN) + RANGES + ORDERS,
+    UINT256: (EQ, IN) + RANGES + ORDERS,
+    ADDRESS: (EQ, IN) + ORDERS,
+    TX_HASH: (EQ, IN) + ORDERS,
+    PUBLIC_KEY: (EQ, IN) + ORDERS,
+    IPFS_HASH: (EQ, IN) + ORDERS,
+}
+# Fields every event has, checked differently from the rest of their kind
+FIELD_CHECKS = {
+    "blockNumber": (EQ, IN, GE, LT, ASC),
+    "blockTs": (EQ, GE, LT) + ORDERS,
+    "txHash": (EQ, IN),
+    "indexedAt": (EQ,),
+    "logIndex": (EQ,),
+}
+
+# Limit of the equality and FilterIn queries, which are expected to return every matching row
+FULL_PAGE_LIMIT = 10000
+# Limit of a field's equality query when it is not FULL_PAGE_LIMIT; None sends no limit
+EQ_LIMITS = {"blockNumber": None, "blockTs": None, "txHash": None, "indexedAt": None, "caller": 50}
+
+# Indexes each event is served under, as in GetByFilters<Event>Idx<index>
+INDEXES = (1, 2, 3)
+
+# Event name, as used in the GetByFilters<Event>IdxN endpoints -> field name -> kind
+EVENTS = {
+    "CheckpointCreateds": {
+        "blockNumber": INT, "blockTs": INT, "shares": UINT256, "assets": UINT256, "txHash": TX_HASH,
+        "indexedAt": INT, "logIndex": INT,
+    },
+    "Depositeds": {
+        "blockNumber": INT, "blockTs": INT, "shares": UINT256, "assets": UINT256, "txHash": TX_HASH,
+        "indexedAt": INT, "logIndex": INT, "caller": ADDRESS, "receiver": ADDRESS, "referrer": ADDRESS,
+        "user": ADDRESS, "vaultAddress": ADDRESS,
+    },
+    "ExitQueueEntereds": {
+        "blockNumber": INT, "blockTs": INT, "shares": UINT256, "positionTicket": UINT256, "txHash": TX_HASH,
+        "indexedAt": INT, "logIndex": INT, "owner": ADDRESS, "receiver": ADDRESS,
+    },
+    "ExitedAssetsClaimeds": {
+        "blockNumber": INT, "blockTs": INT, "prevPositionTicket": UINT256, "newPositionTicket": UINT256,
+        "txHash": TX_HASH, "indexedAt": INT, "logIndex": INT, "withdrawnAssets": UINT256, "receiver": ADDRESS,
+        "user": ADDRESS, "vaultAddress": ADDRESS,
+    },
+    "ExitingAssetsPenalizeds": {
+        "blockNumber": INT, "blockTs": INT, "shares": UINT256, "assets": UINT256, "txHash": TX_HASH,
+        "indexedAt": INT, "logIndex": INT,
+    },
+    "FeeRecipientUpdateds": {
+        "blockNumber": INT, "blockTs": INT, "txHash": TX_HASH, "indexedAt": INT, "logIndex": INT,
+        "caller": ADDRESS, "feeRecipient": ADDRESS,
+    },
+    "FeeSharesMinteds": {
+        "blockNumber": INT, "blockTs": INT, "shares": UINT256, "assets": UINT256, "txHash": TX_HASH,
+        "indexedAt": INT, "logIndex": INT, "receiver": ADDRESS,
+    },
+    "Initializeds": {
+        "blockNumber": INT, "blockTs": INT, "version": UINT256, "txHash": TX_HASH, "indexedAt": INT,
+        "logIndex": INT,
+    },
+    "KeysManagerUpdateds": {
+        "blockNumber": INT, "blockTs": INT, "shares": UINT256, "assets": UINT256, "txHash": TX_HASH,
+        "indexedAt": INT, "logIndex": INT,
+    },
+    "MetadataUpdateds": {
+        "blockNumber": INT, "blockTs": INT, "txHash": TX_HASH, "indexedAt": INT, "logIndex": INT,
+        "caller": ADDRESS, "metadataIpfsHash": IPFS_HASH,
+    },
+    "OsTokenBurneds": {
+        "blockNumber": INT, "blockTs": INT, "shares": UINT256, "assets": UINT256, "txHash": TX_HASH,
+        "indexedAt": INT, "logIndex": INT, "caller": ADDRESS, "user": ADDRESS, "vaultAddress": ADDRESS,
+    },
+    "OsTokenLiquidateds": {
+        "blockNumber": INT, "blockTs": INT, "shares": UINT256, "receivedAssets": UINT256, "txHash": TX_HASH,
+        "indexedAt": INT, "logIndex": INT, "caller": ADDRESS, "receiver": ADDRESS, "user": ADDRESS,
+        "osTokenShares": UINT256,
+    },
+    "OsTokenMinteds": {
+        "blockNumber": INT, "blockTs": INT, "shares": UINT256, "assets": UINT256, "txHash": TX_HASH,
+        "indexedAt": INT, "logIndex": INT, "caller": ADDRESS, "receiver": ADDRESS, "referrer": ADDRESS,
+        "user": ADDRESS, "vaultAddress": ADDRESS,
+    },
+    "OsTokenRedeemeds": {
+        "blockNumber": INT, "blockTs": INT, "shares": UINT256, "assets": UINT256, "txHash": TX_HASH,
+        "indexedAt": INT, "logIndex": INT, "caller": ADDRESS, "receiver": ADDRESS, "user": ADDRESS,
+        "osTokenShares": UINT256,
+    },
+    "Redeemeds": {
+        "blockNumber": INT, "blockTs": INT, "shares": UINT256, "assets": UINT256, "txHash": TX_HASH,
+        "indexedAt": INT, "logIndex": INT, "owner": ADDRESS, "receiver": ADDRESS,
+    },
+    "Upgradeds": {
+        "blockNumber": INT, "blockTs": INT, "txHash": TX_HASH, "indexedAt": INT, "logIndex": INT,
+        "implementation": ADDRESS,
+    },
+    "V2ExitQueueEntereds": {
+        "blockNumber": INT, "blockTs": INT, "shares": UINT256, "positionTicket": UINT256, "txHash": TX_HASH,
+        "indexedAt": INT, "logIndex": INT, "owner": ADDRESS, "receiver": ADDRESS, "assets": UINT256,
+        "user": ADDRESS, "vaultAddress": ADDRESS,
+    },
+    "ValidatorRegistereds": {
+        "blockNumber": INT, "blockTs": INT, "publicKey": PUBLIC_KEY, "txHash": TX_HASH, "indexedAt": INT,
+        "logIndex": INT,
+    },
+    "ValidatorsManagerUpdateds": {
+        "blockNumber": INT, "blockTs": INT, "txHash": TX_HASH, "indexedAt": INT, "logIndex": INT,
+        "caller": ADDRESS, "validatorsManager": ADDRESS,
+    },
+    "ValidatorsRootUpdateds": {
+        "blockNumber": INT, "blockTs": INT, "txHash": TX_HASH, "indexedAt": INT, "logIndex": INT,
+        "caller": ADDRESS, "validatorsRoot": TX_HASH,
+    },
+}
+
+_ENDPOINT_PATTERN = re.compile(r"GetByFilters(\w+?)Idx\d+")
+
+
+def event_urls(event):
+    """Returns the GetByFilters<Event>IdxN URLs of an event, one per index."""
+    return [f"{BASE_URL}api/v1/events/GetByFilters{event}Idx{index}" for index in INDEXES]
+
+
+def field_checks(event, field):
+    """Returns the checks run against a field of an event, see KIND_CHECKS and FIELD_CHECKS."""
+    return FIELD_CHECKS.get(field, KIND_CHECKS[EVENTS[event][field]])
+
+
+def event_from_url(url):
+    """
+    Returns the event name of a GetByFilters<Event>IdxN URL, or None if it is not a registered event.
+    """
+    match = _ENDPOINT_PATTERN.search(url)
+    if match is None or match.group(1) not in EVENTS:
+        return None
+    return match.group(1)
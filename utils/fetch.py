@@ -1,18 +1,200 @@
+import time
+
 import requests
 
+from utils import (
+    breaker,
+    cache,
+    cassette,
+    congestion,
+    deadline,
+    hedging,
+    journal,
+    prefetch,
+    revalidation,
+    singleflight,
+    spill,
+    timing,
+    wire
+)
+from utils.deadline import DeadlineExceeded
+from utils.decoding import LazyBody
+from utils.log import get_logger
+from utils.query import Query, prepare_query
+from utils.session import send_get
+from utils.spill import SpilledBody
+from utils.stream import DEFAULT_CHUNK_SIZE, StreamedBody
+
+log = get_logger(__name__)
+
+
+def fetch_get(url, params=None, stream=False):
+    """
+    Send a GET query to the indexer.
+
+    param url: The endpoint URL, or a utils.query.Query carrying its own params.
+    param params: List of 'name=value' strings joined with '&'.
+    param stream: Parse the 'values' array while it downloads; body['values'] is then a single-pass iterator.
+
+    Returns:
+        list: [resp, body]
+    """
+    if isinstance(url, Query):
+        url, params = url.url, url.params
+    params = params or []
+
+    # Hand the query over to the prefetch phase when a test body is only being discovered
+    prefetch.record_query(url, params)
+
+    # Serve the query from the prefetch phase when it was already sent
+    prefetched = prefetch.take(url, params, timeout=deadline.remaining())
+    if prefetched is not None:
+        return prefetched
+
+    # The request may take at most what is left of the running test's budget
+    return fetch_query(url, params, stream, timeout=deadline.request_timeout(), expires=deadline.expiry())
+
+
+def fetch_query(url, params, stream=False, timeout=None, use_cache=True, expires=None, test=None):
+    """
+    Send a query without the prefetch phase; see fetch_get.
+
+    param timeout: Seconds, or a (connect, read) tuple; defaults to the configured timeouts.
+    param expires: Monotonic time the query is cut off at, body and waiting for a shared request included,
+        e.g. utils.deadline.expiry(); it then raises DeadlineExceeded. None for no deadline.
+    param use_cache: Whether the response cache may answer the query and keep its response; False for
+        queries that must see the endpoint's current state.
+    param test: Node id of the test the query is sent for ahead of time, e.g. by the prefetch phase, which the
+        timings and the journal attribute it to; None for the running test.
+    """
+    timeout = timeout or deadline.default_timeout()
+    # Full URL, key, endpoint, shape and event are derived once per distinct query
+    prepared = prepare_query(url, params)
+    log.info("GET %s", prepared.url)
+
+    # Serve repeated queries from the response cache
+    cached = cache.lookup(prepared.key, prepared.endpoint) if use_cache else None
+    if cached is not None:
+        return cached
+
+    # A stream can be read only once, so it is never shared
+    if stream and not cassette.is_active():
+        validators = revalidation.conditional_headers(prepared.key, prepared.endpoint)
+        # Only the headers are awaited here, so streams are smoothed apart from buffered bodies of their shape
+        resp = breaker.call(prepared.endpoint, lambda: congestion.call(
+            lambda: _get(prepared.url, validators, timeout, expires, stream=True),
+            key=(prepared.endpoint, prepared.shape, "stream")))
+        if resp.status_code == 200:
+            # Accounted for and journaled once the body was read to its end or closed
+            download = _Download(url, params, resp, prepared, expires, test)
+            return [resp, StreamedBody(download.chunks(), on_end=download.finish)]
+        wire.account(url, params, resp, len(resp.content))
+        resp = revalidation.resolve(prepared.key, prepared.endpoint, resp)
+        return [resp, _decode(prepared, params, resp, test)]
 
-def fetch_get(url, params):
-    # Construct the full query URL
-    q = url + "?" + "&".join(params) if params else url
-    print(q)
+    # Concurrent identical queries share one request and one decoded body
+    return singleflight.do(prepared.key, prepared.endpoint,
+                           lambda: _send(url, params, prepared, timeout, use_cache, expires, test), expires=expires)
 
-    # Make the HTTP GET request
-    resp = requests.get(q)
 
-    # Attempt to parse the JSON response, with fallback to empty dict on failure
-    try:
-        body = resp.json()
-    except ValueError:
-        body = {}
+def _send(url, params, prepared, timeout, use_cache=True, expires=None, test=None):
+    # Answer from the recorded cassette, or make the HTTP GET request over the shared keep-alive session
+    if cassette.is_replaying():
+        resp = cassette.replay(prepared.key)
+    else:
+        # Revalidate a body stored by an earlier run instead of downloading it again
+        validators = revalidation.conditional_headers(prepared.key, prepared.endpoint)
+        shape = (prepared.endpoint, prepared.shape)
+        # A dead endpoint fails fast instead of every query waiting out its own timeout
+        resp = breaker.call(prepared.endpoint, lambda: congestion.call(
+            lambda: hedging.call(shape, lambda: _get(prepared.url, validators, timeout, expires)), key=shape))
+        wire.account(url, params, resp, len(resp.content))
+        resp = revalidation.resolve(prepared.key, prepared.endpoint, resp)
+        if cassette.is_recording():
+            cassette.record(prepared.key, resp)
+
+    body = _decode(prepared, params, resp, test)
+    if resp.status_code == 200 and use_cache:
+        cache.store(prepared.key, [resp, body], len(resp.content))
 
     return [resp, body]
+
+
+def _get(url, headers, timeout, expires, stream=False):
+    # Runs in the thread reading the response, which may be a hedging worker
+    with deadline.enforce(expires):
+        if stream:
+            return send_get(url, stream=True, headers=headers, timeout=timeout)
+        if not spill.is_enabled():
+            return send_get(url, headers=headers, timeout=timeout)
+        # Read the body ourselves so an oversized one goes to disk instead of memory
+        return spill.read_body(send_get(url, stream=True, headers=headers, timeout=timeout))
+
+
+def _decode(prepared, params, resp, test=None):
+    # The body is decoded on first access; status-only and total-only checks never decode the rows
+    body_type = SpilledBody if getattr(resp, "spilled", False) else LazyBody
+    if not hasattr(resp, "timings"):
+        return body_type(resp.content, prepared.event)
+    body = body_type(resp.content, prepared.event,
+                     on_decode=lambda seconds: timing.record_decode(prepared.url, seconds))
+    _record(prepared, params, resp, body, test)
+    return body
+
+
+def _record(prepared, params, resp, body, test=None):
+    timing.record(prepared.url, resp, test)
+    journal.record(timing.current_test() if test is None else test, prepared, params, resp, body)
+
+
+class _Download:
+    """
+    The body of a streamed response, read for a StreamedBody.
+
+    The chunks iterator holds on to the download but never to the body, so dropping an unfinished body
+    frees it at once instead of leaving a reference cycle to the garbage collector.
+    """
+
+    def __init__(self, url, params, resp, prepared, expires=None, test=None):
+        self.url = url
+        self.params = params
+        self.resp = resp
+        self.prepared = prepared
+        self.expires = expires
+        self.test = test
+        # The body is read after fetch_query returned, so its connection is cut off on its own
+        self.guard = deadline.cut_off(expires, getattr(resp.raw, "connection", None))
+        self.body_bytes = 0
+        self.start = time.perf_counter()
+        # Keep the chunks of a body the revalidation cache can store, once it was read to the end
+        self.kept = [] if revalidation.is_enabled() and revalidation.has_validators(resp) else None
+
+    def chunks(self):
+        chunks = self.resp.iter_content(DEFAULT_CHUNK_SIZE)
+        while True:
+            try:
+                chunk = next(chunks, None)
+            except requests.RequestException as e:
+                if deadline.passed(self.expires):
+                    raise DeadlineExceeded("The response was cut off at the test's deadline") from e
+                raise
+            if chunk is None:
+                if deadline.was_cut_off(self.guard):
+                    raise DeadlineExceeded("The response was cut off at the test's deadline")
+                break
+            self.body_bytes += len(chunk)
+            if self.kept is not None:
+                self.kept.append(chunk)
+            yield chunk
+        if self.kept is not None:
+            revalidation.store_response(self.prepared.key, self.resp, b"".join(self.kept))
+
+    def finish(self, body):
+        resp = self.resp
+        deadline.release(self.guard)
+        wire.account(self.url, self.params, resp, self.body_bytes)
+        # The body is parsed while it downloads, so decoding is part of the download phase here
+        resp.timings["download"] += time.perf_counter() - self.start
+        _record(self.prepared, self.params, resp, body, self.test)
+        # Closing a streamed response hands its connection back to the pool once it was fully read
+        resp.close()
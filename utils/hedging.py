@@ -0,0 +1,162 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from utils import congestion
+
+# Fraction of requests that may be duplicated
+DEFAULT_HEDGE_BUDGET = 0.05
+# Latencies kept per endpoint and query shape
+DEFAULT_HEDGE_WINDOW = 200
+# Latencies needed before a p95 is trusted
+DEFAULT_HEDGE_MIN_SAMPLES = 20
+# Threads running primary and hedged requests
+_HEDGE_WORKERS = 32
+
+
+class LatencyTracker:
+    """
+    Rolling latency window per key, e.g. (endpoint, query shape).
+
+    param window: Number of most recent latencies kept per key.
+    param min_samples: Number of latencies needed before percentile() answers.
+    """
+
+    def __init__(self, window=DEFAULT_HEDGE_WINDOW, min_samples=DEFAULT_HEDGE_MIN_SAMPLES):
+        self.window = window
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+        self._samples = {}
+
+    def add(self, key, seconds):
+        with self._lock:
+            self._samples.setdefault(key, deque(maxlen=self.window)).append(seconds)
+
+    def percentile(self, key, q=0.95):
+        """Returns the q-quantile latency of key in seconds, or None while there are too few samples."""
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None or len(samples) < self.min_samples:
+                return None
+            ordered = sorted(samples)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+class Hedger:
+    """
+    Sends a duplicate of a request that is still outstanding at its shape's observed p95, and takes whichever
+    response arrives first. At most budget * requests duplicates are sent in total.
+
+    A run sends few queries of any one shape, so until a shape has min_samples latencies of its own it is hedged
+    at the p95 of its endpoint, pooled over all of its shapes. The duplicate takes an in-flight slot of the
+    congestion controller and is not sent while the controller is at its limit.
+    """
+
+    def __init__(self, budget=DEFAULT_HEDGE_BUDGET, window=DEFAULT_HEDGE_WINDOW,
+                 min_samples=DEFAULT_HEDGE_MIN_SAMPLES):
+        self.budget = budget
+        self.tracker = LatencyTracker(window, min_samples)
+        self._executor = ThreadPoolExecutor(max_workers=_HEDGE_WORKERS, thread_name_prefix="hedge")
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._hedges = 0
+        self._stats = {}
+
+    def call(self, key, fn):
+        """
+        Run fn, hedging it once if it outlives the p95 of key.
+
+        param key: Latency bucket, (endpoint, query shape); its latencies are also pooled under (endpoint,).
+        param fn: Callable without arguments sending the request.
+        """
+        with self._lock:
+            self._requests += 1
+            stats = self._stats.setdefault(key, {"requests": 0, "hedged": 0, "hedge_won": 0})
+            stats["requests"] += 1
+
+        start = time.perf_counter()
+        delay = self.tracker.percentile(key)
+        if delay is None:
+            delay = self.tracker.percentile(key[:1])
+        if delay is None:
+            result = fn()
+            self._add(key, time.perf_counter() - start)
+            return result
+
+        primary = self._executor.submit(fn)
+        done, _ = wait([primary], timeout=delay)
+        run = None if done else self._take_budget(key, stats)
+        if run is None:
+            result = primary.result()
+            self._add(key, time.perf_counter() - start)
+            return result
+
+        hedge = self._executor.submit(run, fn)
+        pending = {primary, hedge}
+        while True:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            winner = next((future for future in done if future.exception() is None), None)
+            # A failed attempt only counts when the other one failed as well
+            if winner is None and pending:
+                continue
+            if winner is None:
+                return next(iter(done)).result()
+
+            self._add(key, time.perf_counter() - start)
+            if winner is hedge:
+                with self._lock:
+                    stats["hedge_won"] += 1
+            return winner.result()
+
+    def _add(self, key, seconds):
+        self.tracker.add(key, seconds)
+        self.tracker.add(key[:1], seconds)
+
+    def _take_budget(self, key, stats):
+        """Returns the congestion slot's runner for a hedge, or None when the budget or the controller forbid it."""
+        with self._lock:
+            if self._hedges + 1 > self.budget * self._requests:
+                return None
+            run = congestion.reserve(key)
+            if run is None:
+                return None
+            self._hedges += 1
+            stats["hedged"] += 1
+            return run
+
+    def stats(self):
+        """Returns (endpoint, shape) -> {'requests', 'hedged', 'hedge_won'}."""
+        with self._lock:
+            return {key: dict(stats) for key, stats in self._stats.items()}
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_hedger = None
+
+
+def configure_hedging(enabled=False, budget=DEFAULT_HEDGE_BUDGET, min_samples=DEFAULT_HEDGE_MIN_SAMPLES):
+    """
+    Enable or disable request hedging under fetch_get.
+
+    param budget: Fraction of requests that may be duplicated, e.g. 0.05 for 5%.
+    param min_samples: Latencies a query shape, or else its endpoint, needs before it is hedged.
+    """
+    global _hedger
+    if _hedger is not None:
+        _hedger.shutdown()
+    _hedger = Hedger(budget=budget, min_samples=min_samples) if enabled else None
+
+
+def call(key, fn):
+    """Runs fn, hedged when hedging is enabled."""
+    if _hedger is None:
+        return fn()
+    return _hedger.call(key, fn)
+
+
+def hedging_stats():
+    """Returns (endpoint, shape) -> {'requests', 'hedged', 'hedge_won'}, empty while hedging is off."""
+    return _hedger.stats() if _hedger is not None else {}
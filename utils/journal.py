@@ -0,0 +1,211 @@
+"""
+Append-only journal of the requests fetch_get sends, one JSON line per request.
+
+Each line holds ts, test, url, endpoint, shape, params, status, the request phases, latency, wire_bytes,
+body_bytes, rows and total. rows is the number of rows the client saw: it is null when a lazily decoded body
+was never read by its test, since counting them would mean decoding it on the writer thread; total is then
+still taken from the raw body.
+
+Aggregate a journal into per-endpoint and per-filter latency and size percentiles:
+
+    python -m utils.journal request_journal.jsonl
+"""
+import argparse
+import json
+import queue
+import sys
+import threading
+import time
+
+from utils.decoding import LazyBody, fast_total
+from utils.stream import StreamedBody
+from utils.timing import PHASES
+
+# Records written per batch
+DEFAULT_JOURNAL_BATCH = 256
+# Seconds a record may wait in the buffer before its batch is written
+DEFAULT_JOURNAL_FLUSH_INTERVAL = 1.0
+# Percentiles reported by the analysis CLI
+_PERCENTILES = (0.5, 0.9, 0.99)
+
+_STOP = object()
+
+
+class Journal:
+    """
+    Request journal appended to by a background thread.
+
+    Callers only put the record on a queue; the writer thread completes it and writes it in batches, so
+    journaling costs the request path one queue put. The row count of a body is taken when the record is
+    written, without decoding it: it is null for a lazily decoded body nobody read.
+
+    param path: JSON lines file, appended to.
+    param batch_size: Records written per batch.
+    param flush_interval: Seconds a record may wait before its batch is written.
+    """
+
+    def __init__(self, path, batch_size=DEFAULT_JOURNAL_BATCH, flush_interval=DEFAULT_JOURNAL_FLUSH_INTERVAL):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.written = 0
+        self._queue = queue.SimpleQueue()
+        self._file = open(path, "a")
+        self._thread = threading.Thread(target=self._run, name="request-journal", daemon=True)
+        self._thread.start()
+
+    def append(self, record, body=None):
+        """
+        Queue one record.
+
+        param record: JSON-serializable fields of the request.
+        param body: The response body; its row count and 'total' are added when the record is written.
+        """
+        self._queue.put((record, body))
+
+    def close(self):
+        """Write the remaining records and close the file."""
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._file.close()
+
+    def _run(self):
+        while True:
+            batch = []
+            item = self._queue.get()
+            deadline = time.monotonic() + self.flush_interval
+            while item is not _STOP:
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+
+            if batch:
+                self._file.write("".join(json.dumps(_complete(record, body)) + "\n" for record, body in batch))
+                self._file.flush()
+                self.written += len(batch)
+            if item is _STOP:
+                return
+
+
+def _complete(record, body):
+    rows = total = None
+    if isinstance(body, StreamedBody):
+        rows = body.row_count
+        total = body.fields.get("total")
+    elif isinstance(body, LazyBody):
+        total = fast_total(body.content)
+        if body.decoded:
+            values = body.get("values")
+            rows = len(values) if isinstance(values, list) else None
+            total = body.get("total") if total is None else total
+    record["rows"] = rows
+    record["total"] = total
+    return record
+
+
+_journal = None
+
+
+def configure_journal(path=None, batch_size=DEFAULT_JOURNAL_BATCH, flush_interval=DEFAULT_JOURNAL_FLUSH_INTERVAL):
+    """
+    Start or stop journaling the requests fetch_get sends.
+
+    param path: JSON lines file to append to, None to stop.
+    """
+    global _journal
+    close_journal()
+    if path:
+        _journal = Journal(path, batch_size=batch_size, flush_interval=flush_interval)
+
+
+def close_journal():
+    global _journal
+    if _journal is not None:
+        _journal.close()
+        _journal = None
+
+
+def is_enabled():
+    return _journal is not None
+
+
+def record(test, prepared, params, resp, body):
+    """Journal one request; does nothing while journaling is off."""
+    journal = _journal
+    if journal is None:
+        return
+    phases = getattr(resp, "timings", None) or {}
+    journal.append({
+        "ts": time.time(),
+        "test": test,
+        "url": prepared.url,
+        "endpoint": prepared.endpoint,
+        "shape": prepared.shape,
+        "params": list(params),
+        "status": resp.status_code,
+        **{phase: round(phases.get(phase, 0.0), 6) for phase in PHASES},
+        "latency": round(sum(phases.values()), 6),
+        "wire_bytes": getattr(resp, "wire_bytes", None),
+        "body_bytes": getattr(resp, "body_bytes", None),
+    }, body)
+
+
+def _percentile(ordered, q):
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+def summarize(records, group_by):
+    """
+    Returns group -> {'requests', 'latency': [p50, p90, p99], 'wire_bytes': [...], 'body_bytes': [...]}.
+
+    param group_by: Record field to group by, e.g. 'endpoint' or 'shape'.
+    """
+    groups = {}
+    for entry in records:
+        groups.setdefault(entry.get(group_by), []).append(entry)
+
+    summary = {}
+    for name, entries in groups.items():
+        summary[name] = {"requests": len(entries)}
+        for field in ("latency", "wire_bytes", "body_bytes"):
+            ordered = sorted(entry[field] for entry in entries if entry.get(field) is not None)
+            summary[name][field] = [_percentile(ordered, q) for q in _PERCENTILES] if ordered else None
+    return summary
+
+
+def read_journal(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0],
+                                     epilog="A record's 'rows' is null when its test never read the body.")
+    parser.add_argument("path", help="Journal written by pytest --journal.")
+    parser.add_argument("--by", choices=("endpoint", "shape"), action="append",
+                        help="Grouping to report; defaults to both endpoint and filter type.")
+    args = parser.parse_args(argv)
+
+    records = read_journal(args.path)
+    if not records:
+        print(f"No requests in {args.path}.")
+        return 1
+
+    labels = "/".join(f"p{int(q * 100)}" for q in _PERCENTILES)
+    for group_by in args.by or ("endpoint", "shape"):
+        print(f"\nper {'filter type' if group_by == 'shape' else group_by}")
+        print(f"{'':<44} {'requests':>9} {'latency ms ' + labels:>26} {'wire bytes ' + labels:>30}")
+        summary = summarize(records, group_by)
+        for name, entry in sorted(summary.items(), key=lambda item: item[1]["requests"], reverse=True):
+            latency = "/".join(f"{value * 1000:.1f}" for value in entry["latency"]) if entry["latency"] else "-"
+            wire = "/".join(str(value) for value in entry["wire_bytes"]) if entry["wire_bytes"] else "-"
+            print(f"{str(name):<44} {entry['requests']:>9} {latency:>26} {wire:>30}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
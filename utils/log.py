@@ -0,0 +1,87 @@
+import logging
+from collections import deque
+
+DEFAULT_LOG_LEVEL = "INFO"
+# Records kept per test; older ones are dropped first
+DEFAULT_RING_SIZE = 1000
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR")
+
+_FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+
+# Root of the client's loggers; records do not reach the root logger's handlers
+_root = logging.getLogger("indexer")
+_root.propagate = False
+
+
+class RingHandler(logging.Handler):
+    """
+    Keeps the most recent records unformatted; they are only formatted when dumped.
+
+    param capacity: Number of records kept.
+    """
+
+    def __init__(self, capacity=DEFAULT_RING_SIZE):
+        super().__init__()
+        self.records = deque(maxlen=capacity)
+        self.setFormatter(logging.Formatter(_FORMAT))
+
+    def emit(self, record):
+        self.records.append(record)
+
+    def clear(self):
+        self.records.clear()
+
+    def dump(self):
+        """Returns the kept records formatted, oldest first."""
+        return "\n".join(self.format(record) for record in list(self.records))
+
+
+_ring = RingHandler()
+_root.addHandler(_ring)
+_root.setLevel(DEFAULT_LOG_LEVEL)
+
+
+def get_logger(name):
+    """
+    Returns a logger under the client's root logger, e.g. get_logger(__name__).
+
+    Log with %-style arguments (log.debug("%s: %s", key, value)) so nothing is formatted for dropped records.
+    """
+    return logging.getLogger(f"indexer.{name}")
+
+
+def configure_logging(level=DEFAULT_LOG_LEVEL, ring_size=DEFAULT_RING_SIZE):
+    """
+    Set the level of the client's loggers and the size of the per-test ring buffer.
+
+    param level: 'DEBUG' also keeps one record per checked row, 'INFO' one per request.
+    param ring_size: Number of records kept per test.
+    """
+    global _ring
+    _root.removeHandler(_ring)
+    _ring = RingHandler(ring_size)
+    _root.addHandler(_ring)
+    _root.setLevel(level)
+
+
+def detach_foreign_handlers():
+    """
+    Remove every handler but the ring buffer from the client's root logger.
+
+    pytest's log capture attaches its handlers to each non-propagating logger for every test phase; on the
+    client's loggers they would format each record as it is logged and report it next to the ring's dump.
+    Call it at the start of each phase, after pytest attached them.
+    """
+    for handler in list(_root.handlers):
+        if handler is not _ring:
+            _root.removeHandler(handler)
+
+
+def clear_ring():
+    """Forget the records of the previous test."""
+    _ring.clear()
+
+
+def dump_ring():
+    """Returns the records kept since the last clear_ring(), formatted."""
+    return _ring.dump()
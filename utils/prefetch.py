@@ -0,0 +1,299 @@
+import inspect
+import random
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from urllib.parse import urlsplit
+
+from utils import batching, ranges
+from utils.deadline import DeadlineExceeded, budget
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+# Total number of prefetch worker threads
+DEFAULT_PREFETCH_WORKERS = 16
+# Maximum number of prefetch requests in flight against one host
+DEFAULT_PREFETCH_PER_HOST = 8
+# Number of rows drawn for the FilterIn tests
+SEVERAL_VALUES_COUNT = 5
+
+_enabled = False
+_workers = DEFAULT_PREFETCH_WORKERS
+_per_host = DEFAULT_PREFETCH_PER_HOST
+
+_lock = threading.Lock()
+_executor = None
+_host_slots = {}
+_results = {}
+_pinned = {}
+_local = threading.local()
+
+
+class QueryDiscovered(Exception):
+    """Raised by fetch_get while a test body is run only to find out which query it issues."""
+
+
+class QueryUnpredictable(Exception):
+    """Raised while a test body is discovered once it draws a value its real run would draw anew."""
+
+
+def configure_prefetch(enabled=False, workers=DEFAULT_PREFETCH_WORKERS, per_host=DEFAULT_PREFETCH_PER_HOST):
+    """
+    Enable or disable the sample-then-prefetch phase.
+
+    param enabled: When True, samples are pinned per module and URL and the module's queries are prefetched.
+    param workers: Total number of prefetch worker threads.
+    param per_host: Maximum number of prefetch requests in flight against one host.
+    """
+    global _enabled, _workers, _per_host
+    shutdown_prefetch()
+    _enabled = enabled
+    _workers = workers
+    _per_host = per_host
+
+
+def shutdown_prefetch():
+    """Stops the prefetch workers and drops every pending result and pinned sample."""
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+        _results.clear()
+        _pinned.clear()
+        _host_slots.clear()
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def draw_sample(request, extracted_values):
+    """
+    Draw the random row and the several rows a filter test module works with.
+
+    With prefetch enabled the sample is drawn once per module and URL, and every query the module's
+    tests will issue for that URL is sent to the prefetch workers right away; with batching enabled, its
+    equality and FilterIn checks of one field go out as a single FilterIn query, see utils.batching, and
+    with range merging its range checks of one field as sorted superset queries, see utils.ranges.
+
+    param request: The pytest request of the parametrized extract_values_from_response fixture.
+    param extracted_values: Rows extracted from the unfiltered response.
+
+    Returns:
+        tuple: (random_values, several_values)
+    """
+    if not _enabled:
+        return _sample(extracted_values)
+
+    url = request.param
+    key = (request.module.__name__, url)
+    if key not in _pinned:
+        random_values, several_values = _pinned[key] = _sample(extracted_values)
+        tests = discover_queries(request, (url, random_values, several_values))
+        queries = [(query_url, list(params)) for query_url, params in tests]
+        for planner in (batching, ranges):
+            if planner.is_enabled():
+                batches, queries = planner.plan(url, queries)
+                for batch in batches:
+                    submit_batch(batch, owner=request.module.__name__, planner=planner, tests=tests)
+        for query_url, params in queries:
+            submit(query_url, params, owner=request.module.__name__, test=tests[(query_url, tuple(params))])
+    return _pinned[key]
+
+
+def _sample(extracted_values):
+    random_values = random.choice(extracted_values)
+    several_values = random.sample(extracted_values, k=min(SEVERAL_VALUES_COUNT, len(extracted_values)))
+    return random_values, several_values
+
+
+def discover_queries(request, fixture_value):
+    """
+    Enumerate the (url, params) every test of the module issues for the fixture's URL.
+
+    Each test body is run with fetch_get in discovery mode: the first fetch_get call records its query
+    and raises QueryDiscovered, so nothing is sent and no assertion runs. A test drawing a random value for its
+    query, see unpredictable(), is not prefetched.
+
+    Returns:
+        dict: (url, params tuple) -> node id of the first test issuing the query, in collection order.
+    """
+    url = fixture_value[0]
+    queries = {}
+    for item in request.session.items:
+        callspec = getattr(item, "callspec", None)
+        if getattr(item, "module", None) is not request.module or callspec is None:
+            continue
+        if callspec.params.get("extract_values_from_response") != url:
+            continue
+
+        kwargs = {}
+        for name in inspect.signature(item.function).parameters:
+            if name == "extract_values_from_response":
+                kwargs[name] = fixture_value
+            elif name in callspec.params:
+                kwargs[name] = callspec.params[name]
+            else:
+                break
+        else:
+            query = _discover_one(item, kwargs)
+            if query is not None:
+                queries.setdefault(query, item.nodeid)
+    return queries
+
+
+def _discover_one(item, kwargs):
+    _local.discovered = None
+    _local.discovering = True
+    try:
+        item.function(**kwargs)
+    except QueryDiscovered:
+        pass
+    except QueryUnpredictable:
+        log.debug("Not prefetching %s: its query is drawn at random", item.nodeid)
+    except Exception:
+        # A test that fails before its first fetch_get is simply not prefetched
+        log.debug("Not prefetching %s: it failed before its first query", item.nodeid, exc_info=True)
+    finally:
+        _local.discovering = False
+    return _local.discovered
+
+
+def record_query(url, params):
+    """
+    Called by fetch_get first: while a test body is being discovered, record its query and stop it.
+    """
+    if getattr(_local, "discovering", False):
+        _local.discovered = (url, tuple(params))
+        raise QueryDiscovered(url)
+
+
+def unpredictable():
+    """
+    Called by helpers drawing a random value for a test's query, e.g. get_random_limit: a test body being
+    discovered stops, since the query it would record differs from the one its real run sends.
+    """
+    if getattr(_local, "discovering", False):
+        raise QueryUnpredictable()
+
+
+def submit(url, params, owner=None, test=None):
+    """
+    Send one query to the prefetch workers unless the same query is already pending.
+
+    param url: The endpoint URL.
+    param params: The query params, as accepted by fetch_get.
+    param owner: Name of the test module the query belongs to; its leftovers are dropped with discard().
+    param test: Node id of the test the query is sent for, which its timings and journal record name.
+    """
+    key = (url, tuple(params))
+    with _lock:
+        if key in _results:
+            return
+        _results[key] = (owner, _submit(url, params, test))
+
+
+def submit_batch(batch, owner=None, planner=batching, tests=None):
+    """
+    Send a batch to the prefetch workers in place of its member queries.
+
+    Each member's result is cut out of the merged one; members it cannot answer are sent on their own.
+
+    param batch: A Batch of utils.batching or utils.ranges.
+    param planner: The module that planned the batch, utils.batching or utils.ranges.
+    param tests: (url, params tuple) -> node id of the test a member is sent for, as returned by
+        discover_queries; the batch itself is attributed to the test of its first member.
+    """
+    tests = tests or {}
+    members = {}
+    with _lock:
+        for member in batch.members:
+            key = (batch.url, tuple(member.params))
+            if key not in _results:
+                future = Future()
+                _results[key] = (owner, future)
+                members[key] = (member, future, tests.get(key))
+        first = next(iter(members.values()), None)
+        merged = _submit(batch.url, batch.params, first[2]) if first is not None else None
+    if merged is not None:
+        merged.add_done_callback(lambda done: _split(planner, batch, members, done))
+
+
+def _split(planner, batch, members, merged):
+    try:
+        result = merged.result()
+    except Exception:
+        # The members of a failed or cancelled batch are sent on their own
+        result = None
+    fallbacks = 0
+    for key, (member, future, test) in members.items():
+        # A member discarded in the meantime is not answered
+        if not future.set_running_or_notify_cancel():
+            continue
+        answer = planner.split(batch, member, result) if result is not None else None
+        if answer is not None:
+            future.set_result(answer)
+            continue
+
+        fallbacks += 1
+        with _lock:
+            own = _submit(*key, test) if _executor is not None else None
+        if own is None:
+            future.set_exception(RuntimeError("Prefetch was shut down"))
+        else:
+            own.add_done_callback(lambda done, future=future: _forward(done, future))
+    planner.account(batch, fallbacks)
+
+
+def _forward(done, future):
+    try:
+        future.set_result(done.result())
+    except Exception as e:
+        future.set_exception(e)
+
+
+def _submit(url, params, test=None):
+    # Called with _lock held
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=_workers, thread_name_prefix="prefetch")
+    host = urlsplit(url).netloc
+    slots = _host_slots.setdefault(host, threading.BoundedSemaphore(_per_host))
+    return _executor.submit(_fetch_with_slot, slots, url, list(params), test)
+
+
+def _fetch_with_slot(slots, url, params, test):
+    from utils.fetch import fetch_query
+
+    with slots:
+        return fetch_query(url, params, test=test)
+
+
+def take(url, params, timeout=None):
+    """
+    Hand out the prefetched result of a query, waiting for it if it is still in flight.
+
+    param timeout: Seconds to wait at most, e.g. what is left of the test's budget.
+
+    Returns:
+        list: [resp, body] or None when the query was not prefetched.
+
+    Raises:
+        DeadlineExceeded: If the result did not arrive within timeout.
+    """
+    if not _results:
+        return None
+    with _lock:
+        entry = _results.pop((url, tuple(params)), None)
+    if entry is None:
+        return None
+    try:
+        return entry[1].result(timeout=max(timeout, 0.0) if timeout is not None else None)
+    except FutureTimeoutError:
+        raise DeadlineExceeded(f"The test's budget of {budget():g}s ran out waiting for a prefetched query")
+
+
+def discard(owner):
+    """Drops the prefetched results nobody asked for once the owning test module is done."""
+    with _lock:
+        for key in [key for key, (entry_owner, _) in _results.items() if entry_owner == owner]:
+            _results.pop(key)[1].cancel()
+        for key in [key for key in _pinned if key[0] == owner]:
+            del _pinned[key]
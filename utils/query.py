@@ -0,0 +1,186 @@
+from collections import namedtuple
+from functools import lru_cache
+from urllib.parse import quote, urlsplit, urlunsplit
+
+from utils.events import EVENTS, event_from_url
+
+# Distinct (url, params) combinations whose prepared form is kept
+PREPARED_CACHE_SIZE = 16384
+
+
+def split_params(params):
+    """
+    Split fetch_get params into single 'name=value' pieces.
+
+    Tests pass pre-joined strings such as 'receiver=0x...&limit=10000', so every entry may hold several pieces.
+    """
+    return [piece for param in params for piece in param.split("&") if piece]
+
+
+def normalize_url(url):
+    """Lower-cases the scheme and host of an endpoint URL so equal endpoints compare equal."""
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, parts.query, parts.fragment))
+
+
+def query_key(url, params):
+    """
+    Canonical key of a query: the normalized URL plus the sorted param pieces.
+
+    Returns:
+        str: e.g. 'https://host/api/v1/events/GetByFiltersDepositedsIdx1?limit=10000&receiver=0x...'
+    """
+    pieces = sorted(split_params(params))
+    return normalize_url(url) + ("?" + "&".join(pieces) if pieces else "")
+
+
+def endpoint_name(url):
+    """Returns the endpoint part of a URL, e.g. 'GetByFiltersDepositedsIdx1'."""
+    return urlsplit(url).path.rstrip("/").rsplit("/", 1)[-1].strip()
+
+
+# Param name suffix -> query shape
+_SHAPE_SUFFIXES = (
+    ("FilterGt", "gt"),
+    ("FilterGe", "ge"),
+    ("FilterLt", "lt"),
+    ("FilterLe", "le"),
+    ("FilterIn", "in"),
+    ("SortAsc", "sort"),
+    ("SortDesc", "sort"),
+)
+
+
+def param_shape(name):
+    """Returns the shape of one param name: 'eq', 'gt', 'ge', 'lt', 'le', 'in', 'sort' or 'limit'."""
+    if name in ("limit", "offset"):
+        return "limit"
+    for suffix, shape in _SHAPE_SUFFIXES:
+        if name.endswith(suffix):
+            return shape
+    return "eq"
+
+
+def query_shape(params):
+    """
+    Classify a query by its filter: the shape of its first filter or sort param.
+
+    Returns:
+        str: 'eq', 'gt', 'ge', 'lt', 'le', 'in' or 'sort'; 'limit' for paging-only queries, 'none' without params.
+    """
+    shapes = [param_shape(piece.split("=", 1)[0]) for piece in split_params(params)]
+    if not shapes:
+        return "none"
+    return next((shape for shape in shapes if shape != "limit"), "limit")
+
+
+# Everything fetch_get derives from (url, params), computed once per distinct query
+PreparedQuery = namedtuple("PreparedQuery", "url key endpoint shape event")
+
+
+def prepare_query(url, params):
+    """
+    Returns the memoized PreparedQuery of a query: full request URL, canonical key, endpoint, shape and event.
+
+    Raw values in params are URL-encoded the way Query encodes them, so a raw and a built query for the same
+    values share their URL and key; values already encoded are left as they are.
+    """
+    return _prepare_query(url, tuple(params))
+
+
+def encode_piece(piece):
+    """URL-encodes the value of one 'name=value' piece, keeping '%' escapes and the commas of FilterIn lists."""
+    name, sep, value = piece.partition("=")
+    return name + sep + quote(value, safe="%,")
+
+
+@lru_cache(maxsize=PREPARED_CACHE_SIZE)
+def _prepare_query(url, params):
+    params = tuple(encode_piece(piece) for piece in split_params(params))
+    return PreparedQuery(
+        url=url + "?" + "&".join(params) if params else url,
+        key=query_key(url, params),
+        endpoint=endpoint_name(url),
+        shape=query_shape(params),
+        event=event_from_url(url),
+    )
+
+
+class Query:
+    """
+    Builder for GetByFilters* queries, validating field names against the event registry.
+
+        Query(URL_1).eq("receiver", address).limit(10000)
+        Query(URL_1).gt("shares", value)
+        Query(URL_1).filter_in("caller", addresses).sort_desc("blockTs")
+
+    Values are URL-encoded once, when added. Pass the query straight to fetch_get.
+
+    param url: A GetByFilters<Event>IdxN endpoint URL.
+
+    Raises:
+        ValueError: If the URL is not a registered event endpoint.
+    """
+
+    def __init__(self, url):
+        self.url = url
+        self.event = event_from_url(url)
+        if self.event is None:
+            raise ValueError(f"Not a registered GetByFilters event endpoint: {url}")
+        self._params = []
+
+    @property
+    def params(self):
+        """The 'name=value' params as accepted by fetch_get."""
+        return list(self._params)
+
+    @property
+    def key(self):
+        """Canonical key of the query, the same one the response caches use."""
+        return prepare_query(self.url, self._params).key
+
+    def eq(self, field, value):
+        return self._add(self._field(field), value)
+
+    def gt(self, field, value):
+        return self._add(self._field(field) + "FilterGt", value)
+
+    def ge(self, field, value):
+        return self._add(self._field(field) + "FilterGe", value)
+
+    def lt(self, field, value):
+        return self._add(self._field(field) + "FilterLt", value)
+
+    def le(self, field, value):
+        return self._add(self._field(field) + "FilterLe", value)
+
+    def filter_in(self, field, values):
+        return self._add(self._field(field) + "FilterIn", ",".join(_encode(value) for value in values), encoded=True)
+
+    def sort_asc(self, field):
+        return self._add(self._field(field) + "SortAsc", "True")
+
+    def sort_desc(self, field):
+        return self._add(self._field(field) + "SortDesc", "True")
+
+    def limit(self, limit):
+        return self._add("limit", int(limit))
+
+    def offset(self, offset):
+        return self._add("offset", int(offset))
+
+    def _field(self, field):
+        if field not in EVENTS[self.event]:
+            raise ValueError(f"{self.event} has no field '{field}', fields: {', '.join(EVENTS[self.event])}")
+        return field
+
+    def _add(self, name, value, encoded=False):
+        self._params.append(f"{name}={value if encoded else _encode(value)}")
+        return self
+
+    def __repr__(self):
+        return f"Query({prepare_query(self.url, self._params).url!r})"
+
+
+def _encode(value):
+    return quote(str(value), safe="")
@@ -1,5 +1,9 @@
 import random
 
+from utils.prefetch import unpredictable
+
 
 def get_random_limit():
+    # A fresh limit on every call, so a test drawing one is not prefetched
+    unpredictable()
     return random.randint(1, 50)
@@ -0,0 +1,147 @@
+import threading
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from urllib.parse import unquote
+
+from utils.events import EVENTS, NUMERIC_KINDS, event_from_url
+from utils.query import param_shape, split_params
+
+# Range shapes bounding a field from below and from above
+_LOWER = ("gt", "ge")
+_UPPER = ("lt", "le")
+
+_enabled = False
+_lock = threading.Lock()
+_stats = {"batches": 0, "queries": 0, "fallbacks": 0}
+
+# One sorted query standing in for the range checks of one field that bound it from the same side
+Batch = namedtuple("Batch", "url field side params members")
+# One of the original range queries of a batch
+Member = namedtuple("Member", "params shape value")
+
+
+def configure_ranges(enabled=False):
+    """
+    Enable or disable answering the prefetched range checks of one field from one sorted superset query.
+
+    Off by default: each range query is then sent as it is, which is what tests the server's filters.
+    """
+    global _enabled
+    _enabled = enabled
+
+
+def is_enabled():
+    return _enabled
+
+
+def plan(url, queries):
+    """
+    Group the range queries of one endpoint by field, side and remaining params.
+
+    The Gt/Ge checks of a field share one '<field>FilterGe=<lowest bound>&<field>SortAsc=True' query, the Lt/Le
+    checks one '<field>FilterLe=<highest bound>&<field>SortDesc=True' query, each keeping the members' other
+    params (e.g. limit). Only numeric fields are merged, and only groups of at least two queries.
+
+    param url: The endpoint URL the queries were discovered for.
+    param queries: (url, params) pairs, as returned by utils.prefetch.discover_queries.
+
+    Returns:
+        tuple: (list of Batch, list of the (url, params) pairs not batched)
+    """
+    fields = EVENTS.get(event_from_url(url), {})
+    groups = {}
+    rest = []
+    for query_url, params in queries:
+        check = _range_check(params, fields) if query_url == url else None
+        if check is None:
+            rest.append((query_url, params))
+        else:
+            field, shape, value, others = check
+            side = "lower" if shape in _LOWER else "upper"
+            members = groups.setdefault((field, side, others), {})
+            members.setdefault(tuple(params), Member(list(params), shape, value))
+
+    batches = []
+    for (field, side, others), members in groups.items():
+        members = list(members.values())
+        if len(members) < 2:
+            rest.extend((url, member.params) for member in members)
+            continue
+        if side == "lower":
+            bound = [f"{field}FilterGe={min(member.value for member in members)}", f"{field}SortAsc=True"]
+        else:
+            bound = [f"{field}FilterLe={max(member.value for member in members)}", f"{field}SortDesc=True"]
+        batches.append(Batch(url, field, side, bound + list(others), members))
+    return batches, rest
+
+
+def _range_check(params, fields):
+    """Returns (field, shape, int bound, other pieces) for a query of exactly one numeric range piece."""
+    check = None
+    others = []
+    for piece in split_params(params):
+        name, _, value = piece.partition("=")
+        shape = param_shape(name)
+        if shape == "limit":
+            others.append(piece)
+        elif shape in _LOWER + _UPPER and check is None:
+            check = (name[:-len("FilterGt")], shape, unquote(value))
+        else:
+            return None
+    if check is None or fields.get(check[0]) not in NUMERIC_KINDS:
+        return None
+    field, shape, value = check
+    try:
+        return field, shape, int(value), tuple(sorted(others))
+    except ValueError:
+        return None
+
+
+def split(batch, member, result):
+    """
+    Answer one member from the batch's sorted result: its rows are found by bisecting on the field.
+
+    param result: [resp, body] of the batch's sorted query.
+
+    Returns:
+        list: [resp, body] for the member, or None when the result cannot stand in for it: it is not a 200,
+        is not sorted as asked for, or holds rows but none for the member.
+    """
+    resp, body = result
+    if resp.status_code != 200:
+        return None
+    rows = body.get("values")
+    if not isinstance(rows, list):
+        return None
+    try:
+        keys = [int(row[batch.field]) for row in rows]
+    except (KeyError, TypeError, ValueError):
+        return None
+
+    # Bisect on ascending keys; a descending result is negated into one
+    value = member.value
+    if batch.side == "upper":
+        keys = [-key for key in keys]
+        value = -value
+    if any(keys[i] > keys[i + 1] for i in range(len(keys) - 1)):
+        return None
+    inclusive = member.shape in ("ge", "le")
+    selected = rows[(bisect_left if inclusive else bisect_right)(keys, value):]
+    # A page of the superset may end before any of the member's rows
+    if rows and not selected:
+        return None
+    return [resp, {"values": selected, "total": len(selected)}]
+
+
+def account(batch, fallbacks):
+    """Count one answered batch and how many of its members had to be sent on their own."""
+    with _lock:
+        _stats["batches"] += 1
+        _stats["queries"] += len(batch.members)
+        _stats["fallbacks"] += fallbacks
+
+
+def ranges_stats():
+    """Returns {'batches', 'queries', 'fallbacks'}: sorted queries sent, range queries they stood in for, fallbacks."""
+    with _lock:
+        return dict(_stats)
@@ -0,0 +1,169 @@
+import json
+import os
+import threading
+
+from requests.structures import CaseInsensitiveDict
+
+from utils.store import ContentStore
+from utils.wire import stored_headers
+
+DEFAULT_HTTP_CACHE_DIR = ".http_cache"
+
+
+class RevalidationCache:
+    """
+    On-disk HTTP cache keeping the validators (ETag, Last-Modified) and body of every 200 response.
+
+    The next run sends If-None-Match / If-Modified-Since, and a 304 answer is completed with the stored body.
+    Entries live in an append-only index.jsonl pointing at bodies in a ContentStore; the index is loaded into
+    a dict on open and compacted when superseded entries make up most of it.
+
+    param root: Directory holding index.jsonl and the objects store.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.store = ContentStore(root)
+        self.index = {}
+        self._lock = threading.Lock()
+        self._stats = {}
+
+        lines = 0
+        index_path = os.path.join(root, "index.jsonl")
+        if os.path.exists(index_path):
+            with open(index_path) as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.index[entry["key"]] = entry
+                        lines += 1
+        if lines > 2 * len(self.index):
+            self._compact()
+
+    def conditional_headers(self, key, endpoint):
+        """
+        Returns the If-None-Match / If-Modified-Since headers for a query key; empty if nothing is stored.
+
+        param endpoint: Name the counters are kept under.
+        """
+        entry = self.index.get(key)
+        if entry is None:
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        with self._lock:
+            self._endpoint_stats(endpoint)["revalidations"] += 1
+        return headers
+
+    def resolve(self, key, endpoint, resp):
+        """
+        Complete a 304 answer with the stored body, or store the validators and body of a 200 answer.
+
+        A 304 is turned into the stored 200 response in place and flagged with resp.revalidated = True.
+
+        Returns:
+            requests.Response: resp
+        """
+        resp.revalidated = False
+        entry = self.index.get(key)
+        if resp.status_code == 304 and entry is not None:
+            content = self.store.get(entry["body"])
+            if content is not None:
+                fresh = stored_headers(resp.headers)
+                resp.headers = CaseInsensitiveDict(entry["headers"])
+                resp.headers.update(fresh)
+                resp.status_code = 200
+                resp.reason = "OK"
+                resp._content = content
+                resp.revalidated = True
+                with self._lock:
+                    stats = self._endpoint_stats(endpoint)
+                    stats["not_modified"] += 1
+                    stats["bytes_saved"] += max(len(content) - getattr(resp, "wire_bytes", 0), 0)
+                return resp
+
+        if resp.status_code == 200:
+            self.store_response(key, resp, resp.content)
+        return resp
+
+    def store_response(self, key, resp, content):
+        """Keep the body of a 200 response carrying an ETag or Last-Modified header."""
+        if not has_validators(resp):
+            return
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        entry = {
+            "key": key,
+            "etag": etag,
+            "last_modified": last_modified,
+            "headers": stored_headers(resp.headers),
+            "body": self.store.put(content),
+        }
+        with self._lock:
+            previous = self.index.get(key)
+            if previous is not None and all(previous[name] == entry[name]
+                                            for name in ("etag", "last_modified", "body")):
+                return
+            self.index[key] = entry
+            os.makedirs(self.root, exist_ok=True)
+            with open(os.path.join(self.root, "index.jsonl"), "a") as f:
+                f.write(json.dumps(entry) + "\n")
+
+    def stats(self):
+        """Returns endpoint -> {'revalidations', 'not_modified', 'bytes_saved'}."""
+        with self._lock:
+            return {endpoint: dict(stats) for endpoint, stats in self._stats.items()}
+
+    def _endpoint_stats(self, endpoint):
+        return self._stats.setdefault(endpoint, {"revalidations": 0, "not_modified": 0, "bytes_saved": 0})
+
+    def _compact(self):
+        index_path = os.path.join(self.root, "index.jsonl")
+        tmp_path = index_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            for entry in self.index.values():
+                f.write(json.dumps(entry) + "\n")
+        os.replace(tmp_path, index_path)
+
+
+def has_validators(resp):
+    """Whether a response can be revalidated later."""
+    return "ETag" in resp.headers or "Last-Modified" in resp.headers
+
+
+_cache = None
+
+
+def configure_revalidation(enabled=False, root=DEFAULT_HTTP_CACHE_DIR):
+    """
+    Enable or disable conditional requests under fetch_get.
+
+    param root: Directory of the on-disk cache; kept between runs.
+    """
+    global _cache
+    _cache = RevalidationCache(root) if enabled else None
+
+
+def is_enabled():
+    return _cache is not None
+
+
+def conditional_headers(key, endpoint):
+    return _cache.conditional_headers(key, endpoint) if _cache is not None else {}
+
+
+def resolve(key, endpoint, resp):
+    return _cache.resolve(key, endpoint, resp) if _cache is not None else resp
+
+
+def store_response(key, resp, content):
+    if _cache is not None:
+        _cache.store_response(key, resp, content)
+
+
+def revalidation_stats():
+    """Returns endpoint -> {'revalidations', 'not_modified', 'bytes_saved'}, empty while revalidation is off."""
+    return _cache.stats() if _cache is not None else {}
@@ -0,0 +1,151 @@
+import threading
+from functools import lru_cache
+
+import requests
+
+from utils import timing
+from utils.timing import TimedHTTPAdapter
+from utils.transports import UNIX_SCHEME, UnixHTTPAdapter
+from utils.wire import DEFAULT_ACCEPT_ENCODING
+
+# Number of keep-alive connections kept open per host
+DEFAULT_POOL_SIZE = 10
+# Number of per-host pools the session keeps before evicting the least recently used one
+DEFAULT_POOL_HOSTS = 10
+# Distinct query URLs whose prepared request is kept
+PREPARED_REQUESTS_SIZE = 16384
+
+_lock = threading.Lock()
+_session = None
+_pool_size = DEFAULT_POOL_SIZE
+_pool_hosts = DEFAULT_POOL_HOSTS
+_accept_encoding = DEFAULT_ACCEPT_ENCODING
+_mounts = {}
+
+
+def configure_session(pool_size=DEFAULT_POOL_SIZE, pool_hosts=DEFAULT_POOL_HOSTS,
+                      accept_encoding=DEFAULT_ACCEPT_ENCODING):
+    """
+    Set the connection pool sizing used by the shared session.
+
+    An already opened session is closed, so the next request picks up the new sizing.
+
+    param pool_size: Maximum number of keep-alive connections kept per host.
+    param pool_hosts: Maximum number of hosts whose pools are kept at the same time.
+    param accept_encoding: Accept-Encoding header sent with every query, see utils.wire.accept_encoding_header.
+    """
+    global _pool_size, _pool_hosts, _accept_encoding
+    close_session()
+    _pool_size = pool_size
+    _pool_hosts = pool_hosts
+    _accept_encoding = accept_encoding
+
+
+def get_session():
+    """Returns the shared keep-alive session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                session = requests.Session()
+                session.headers["Accept-Encoding"] = _accept_encoding
+                adapter = TimedHTTPAdapter(pool_connections=_pool_hosts, pool_maxsize=_pool_size)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                session.mount(UNIX_SCHEME, UnixHTTPAdapter(pool_connections=_pool_hosts, pool_maxsize=_pool_size))
+                for prefix, app_adapter in _mounts.items():
+                    session.mount(prefix, app_adapter)
+                _session = session
+    return _session
+
+
+def mount(prefix, adapter):
+    """
+    Send the requests whose URL starts with prefix through adapter, e.g. an in-process application.
+
+    param prefix: URL prefix such as 'http://indexer.local/'.
+    param adapter: A requests transport adapter, see utils.transports.app_adapter.
+    """
+    close_session()
+    _mounts[prefix] = adapter
+
+
+def close_session():
+    """Closes the shared session and all of its pooled connections."""
+    global _session
+    with _lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+        _prepared_get.cache_clear()
+        _send_settings.cache_clear()
+
+
+def send_get(url, stream=False, headers=None, timeout=None):
+    """
+    Send a GET through the shared session, reusing the prepared request of url.
+
+    Headers, URL encoding and environment settings are worked out once per URL instead of on every call.
+    The phases of the request are set on the response as resp.timings, see utils.timing.
+
+    param url: Full request URL including the query string.
+    param stream: Leave the body unread, see requests' stream=True.
+    param headers: Extra headers for this call only, e.g. If-None-Match.
+    param timeout: Seconds, or a (connect, read) tuple, as accepted by requests.
+    """
+    session = get_session()
+    prepared = _prepared_get(url).copy()
+    if headers:
+        prepared.headers.update(headers)
+    timing.begin()
+    try:
+        resp = session.send(prepared, stream=stream, timeout=timeout, **_send_settings(url.split("?", 1)[0]))
+    finally:
+        phases = timing.finish()
+    resp.timings = phases
+    return resp
+
+
+@lru_cache(maxsize=PREPARED_REQUESTS_SIZE)
+def _prepared_get(url):
+    return get_session().prepare_request(requests.Request("GET", url))
+
+
+@lru_cache(maxsize=256)
+def _send_settings(url):
+    # Proxy/verify/cert settings depend only on the endpoint, not on the query string
+    settings = get_session().merge_environment_settings(url, {}, None, None, None)
+    # stream is chosen per call
+    del settings["stream"]
+    settings["allow_redirects"] = True
+    return settings
+
+
+def connection_stats():
+    """
+    Collect connection reuse counters from the pools of the shared session.
+
+    Returns:
+        dict: Host -> {'requests', 'new_connections', 'reused'} for every pool still alive; new_connections
+        counts every connection opened, including reconnects of a pooled connection the server had closed.
+    """
+    stats = {}
+    if _session is None:
+        return stats
+
+    for adapter in set(_session.adapters.values()):
+        # In-process applications have no connections
+        if not hasattr(adapter, "poolmanager"):
+            continue
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host = getattr(pool, "origin", None) or f"{pool.scheme}://{pool.host}:{pool.port}"
+            entry = stats.setdefault(host, {"requests": 0, "new_connections": 0, "reused": 0})
+            entry["requests"] += pool.num_requests
+            opened = timing.handshakes(host)
+            entry["new_connections"] = opened
+            entry["reused"] = max(entry["requests"] - opened, 0)
+    return stats
@@ -0,0 +1,81 @@
+import threading
+import time
+
+from utils.deadline import DeadlineExceeded
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls with the same key into one: the first caller runs the function,
+    callers arriving while it runs wait for it and get the same result (or exception).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._stats = {}
+
+    def do(self, key, group, fn, expires=None):
+        """
+        Run fn once for all concurrent callers of key.
+
+        param key: Identity of the call, e.g. the canonical query key.
+        param group: Name the counters are kept under, e.g. the endpoint.
+        param fn: Callable without arguments.
+        param expires: Monotonic time a caller waiting for another's call gives up at; None waits for it.
+
+        Raises:
+            DeadlineExceeded: If the call another caller runs did not finish by expires.
+        """
+        with self._lock:
+            stats = self._stats.setdefault(group, {"calls": 0, "collapsed": 0})
+            stats["calls"] += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                stats["collapsed"] += 1
+
+        if not leader:
+            timeout = None if expires is None else max(expires - time.monotonic(), 0.0)
+            if not call.done.wait(timeout):
+                raise DeadlineExceeded("Gave up waiting for the same query sent by another caller at the deadline")
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self):
+        """Returns group -> {'calls', 'collapsed'}."""
+        with self._lock:
+            return {group: dict(stats) for group, stats in self._stats.items()}
+
+
+_flight = SingleFlight()
+
+
+def do(key, group, fn, expires=None):
+    return _flight.do(key, group, fn, expires)
+
+
+def singleflight_stats():
+    """Returns endpoint -> {'calls', 'collapsed'} for the queries sent through fetch_get."""
+    return _flight.stats()
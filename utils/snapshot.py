@@ -0,0 +1,119 @@
+import threading
+import time
+
+from utils import cassette, deadline
+from utils.fetch import fetch_get, fetch_query
+
+# Params of the probe telling whether an endpoint's rows changed: its newest row and the total
+PROBE_PARAMS = ["indexedAtSortDesc=True", "limit=1"]
+# Seconds a snapshot is handed out without probing the endpoint again
+DEFAULT_PROBE_INTERVAL = 5.0
+
+_enabled = True
+_probe_interval = DEFAULT_PROBE_INTERVAL
+_lock = threading.Lock()
+_snapshots = {}
+_stats = {"taken": 0, "reused": 0, "invalidated": 0}
+
+
+class _Snapshot:
+    def __init__(self):
+        self.signature = None
+        self.values = None
+        self.probed_at = None
+        self.lock = threading.Lock()
+
+
+def configure_snapshots(enabled=True, probe_interval=DEFAULT_PROBE_INTERVAL):
+    """
+    Enable or disable the per-URL snapshots of the unfiltered rows the filter tests draw their samples from.
+
+    When disabled every test fetches and extracts the unfiltered rows again.
+
+    param probe_interval: Seconds a snapshot is handed out before the endpoint is probed for changes again;
+        0 probes before every test.
+    """
+    global _enabled, _probe_interval
+    _enabled = enabled
+    _probe_interval = probe_interval
+    clear_snapshots()
+
+
+def clear_snapshots():
+    """Forget every snapshot and reset the stats."""
+    with _lock:
+        _snapshots.clear()
+        for name in _stats:
+            _stats[name] = 0
+
+
+def snapshot_values(url, extract):
+    """
+    Returns the values extracted from the unfiltered rows of an endpoint, fetched once per URL and run.
+
+    Before a snapshot is handed out again, at most once per probe interval, a probe query (newest row by
+    indexedAt, limit 1) checks that the endpoint's 'total' and newest indexedAt are unchanged; otherwise the
+    rows are fetched and extracted again. The probe and the refetch bypass the response cache, which could
+    otherwise answer them with what the snapshot already holds. Replayed runs never change, so they are not
+    probed.
+
+    param url: The endpoint URL.
+    param extract: Called with the unfiltered response body, returns the list of values; it must not be
+        mutated by its users since it is shared.
+
+    Returns:
+        list: What extract returned, possibly for an earlier test.
+    """
+    if not _enabled:
+        return extract(fetch_get(url, params=[])[1])
+
+    key = (url, extract.__module__, extract.__qualname__)
+    with _lock:
+        snapshot = _snapshots.setdefault(key, _Snapshot())
+
+    # Tests of one URL running in parallel wait for a single fetch
+    with snapshot.lock:
+        now = time.monotonic()
+        if snapshot.values is not None and (cassette.is_replaying() or now - snapshot.probed_at < _probe_interval):
+            _count("reused")
+            return snapshot.values
+
+        signature = _probe(url) if not cassette.is_replaying() else None
+        if snapshot.values is not None and signature == snapshot.signature:
+            snapshot.probed_at = now
+            _count("reused")
+            return snapshot.values
+
+        resp, body = _fetch_current(url, [])
+        values = extract(body)
+        if resp.status_code == 200:
+            _count("invalidated" if snapshot.values is not None else "taken")
+            snapshot.signature = signature
+            snapshot.values = values
+            snapshot.probed_at = now
+        return values
+
+
+def _probe(url):
+    """Returns (total, newest indexedAt) of an endpoint, or a value equal to no other when the probe failed."""
+    resp, body = _fetch_current(url, PROBE_PARAMS)
+    if resp.status_code != 200:
+        return object()
+    rows = body.get("values") or [{}]
+    return body.get("total"), rows[0].get("indexedAt")
+
+
+def _fetch_current(url, params):
+    # Within a test the query may take at most what is left of its budget
+    return fetch_query(url, params, timeout=deadline.request_timeout(), use_cache=False, expires=deadline.expiry())
+
+
+def _count(name):
+    with _lock:
+        _stats[name] += 1
+
+
+def snapshot_stats():
+    """Returns {'taken', 'reused', 'invalidated'}: snapshots fetched, handed out again and fetched anew."""
+    with _lock:
+        return dict(_stats)
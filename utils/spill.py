@@ -0,0 +1,166 @@
+import json
+import mmap
+import tempfile
+import threading
+import time
+from array import array
+from collections.abc import Sequence
+
+from utils.decoding import LazyBody
+from utils.stream import DEFAULT_CHUNK_SIZE, StreamedBody
+
+# Bodies larger than this are written to a temporary file instead of being held in memory; None keeps every
+# body in memory. Off by default: a spilled body's rows are parsed on access and never typed-decoded.
+DEFAULT_MAX_BODY_SIZE = None
+
+_max_body_size = DEFAULT_MAX_BODY_SIZE
+_directory = None
+_lock = threading.Lock()
+_stats = {"spilled": 0, "bytes": 0, "largest": 0}
+
+
+def configure_spill(max_body_size=DEFAULT_MAX_BODY_SIZE, directory=None):
+    """
+    Set the size above which fetch_get keeps a response body on disk.
+
+    param max_body_size: Bytes of decompressed body held in memory; 0 or None reads every body into memory.
+    param directory: Directory of the temporary files; None for the system default.
+    """
+    global _max_body_size, _directory
+    _max_body_size = max_body_size or None
+    _directory = directory
+
+
+def is_enabled():
+    return _max_body_size is not None
+
+
+def read_body(resp):
+    """
+    Read the body of a response sent with stream=True.
+
+    Up to the configured maximum the body is read into memory as usual. Past it the body goes to an unlinked
+    temporary file, and resp.content becomes a read-only memory map of that file with resp.spilled set, so
+    the process never holds the whole body; the file is removed once the response is garbage collected.
+    The read is added to resp.timings['download'].
+
+    Returns:
+        requests.Response: resp, fully read and with its connection handed back to the pool.
+    """
+    start = time.perf_counter()
+    chunks = []
+    size = 0
+    spill = None
+    try:
+        for chunk in resp.iter_content(DEFAULT_CHUNK_SIZE):
+            size += len(chunk)
+            if spill is None and size > _max_body_size:
+                spill = tempfile.TemporaryFile(dir=_directory)
+                spill.writelines(chunks)
+                chunks = None
+            if spill is not None:
+                spill.write(chunk)
+            else:
+                chunks.append(chunk)
+        if spill is None:
+            resp._content = b"".join(chunks)
+            resp.spilled = False
+        else:
+            spill.flush()
+            # The map keeps its own handle on the file
+            resp._content = mmap.mmap(spill.fileno(), 0, access=mmap.ACCESS_READ)
+            resp.spilled = True
+            with _lock:
+                _stats["spilled"] += 1
+                _stats["bytes"] += size
+                _stats["largest"] = max(_stats["largest"], size)
+    finally:
+        if spill is not None:
+            spill.close()
+        resp.close()
+        if hasattr(resp, "timings"):
+            resp.timings["download"] += time.perf_counter() - start
+    return resp
+
+
+def spill_stats():
+    """Returns {'spilled', 'bytes', 'largest'}: bodies kept on disk, their summed and their largest size."""
+    with _lock:
+        return dict(_stats)
+
+
+def _chunks(content):
+    for start in range(0, len(content), DEFAULT_CHUNK_SIZE):
+        yield content[start:start + DEFAULT_CHUNK_SIZE]
+
+
+class SpilledRows(Sequence):
+    """
+    The 'values' array of a spilled body.
+
+    Rows are parsed from the file on every access and only one is held in memory at a time; the byte range
+    of each row, found when the body was first parsed, takes indexing straight to its row.
+
+    param content: The mapped body.
+    param offsets: Start and end byte offset of every row, in order, see StreamedBody.
+    """
+
+    def __init__(self, content, offsets):
+        self.content = content
+        self.offsets = offsets
+        self.count = len(offsets) // 2
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self._row(index)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(self.count))]
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("row index out of range")
+        return self._row(index)
+
+    def _row(self, index):
+        return json.loads(self.content[self.offsets[2 * index]:self.offsets[2 * index + 1]])
+
+    def __repr__(self):
+        return f"<SpilledRows {self.count} rows>"
+
+
+class SpilledBody(LazyBody):
+    """
+    Body of a spilled response, see read_body.
+
+    Decoding parses the file once to collect the top-level fields and the byte range of each row without
+    keeping the rows; 'values' is a SpilledRows. Rows come as they are in the JSON, typed decoding does not
+    apply to them.
+    """
+
+    def __repr__(self):
+        return f"<SpilledBody {len(self.content)} bytes>"
+
+    def _decode(self):
+        if self._data is None:
+            start = time.perf_counter()
+            offsets = array("Q")
+            parsed = StreamedBody(_chunks(self.content), offsets=offsets)
+            try:
+                for _ in parsed["values"]:
+                    pass
+                # Parse the members following the array
+                parsed.get(None)
+            except ValueError:
+                data = {}
+            else:
+                data = parsed.fields
+                data.setdefault(parsed.array_key, SpilledRows(self.content, offsets))
+            self._data = data
+            if self._on_decode is not None:
+                self._on_decode(time.perf_counter() - start)
+        return self._data
@@ -0,0 +1,43 @@
+import gzip
+import hashlib
+import os
+import tempfile
+
+
+class ContentStore:
+    """
+    Compressed, content-addressed blob store on disk.
+
+    Every blob is saved once under objects/<first two hex digits>/<sha256>.gz, so identical bodies share one file.
+
+    param root: Directory the store lives in; created on first write.
+    """
+
+    def __init__(self, root):
+        self.root = root
+
+    def path(self, digest):
+        return os.path.join(self.root, "objects", digest[:2], digest + ".gz")
+
+    def put(self, data):
+        """Stores data unless it is already present and returns its sha256 hex digest."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path(digest)
+        if os.path.exists(path):
+            return digest
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary file first so a concurrent reader never sees a partial blob
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, "wb") as f:
+            f.write(gzip.compress(data, compresslevel=6))
+        os.replace(tmp_path, path)
+        return digest
+
+    def get(self, digest):
+        """Returns the blob stored under digest, or None if it is missing."""
+        try:
+            with open(self.path(digest), "rb") as f:
+                return gzip.decompress(f.read())
+        except FileNotFoundError:
+            return None
@@ -0,0 +1,212 @@
+import codecs
+import json
+import re
+from collections import deque
+
+# Bytes read from the socket per step
+DEFAULT_CHUNK_SIZE = 64 * 1024
+# Consumed text kept in the buffer before it is cut off
+_COMPACT_AFTER = 256 * 1024
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_decoder = json.JSONDecoder()
+_END = object()
+
+
+class StreamedBody:
+    """
+    Top-level JSON object of a response, parsed incrementally while it is downloaded.
+
+    The 'values' array is handed out as a single-pass iterator of rows, so checks run while the rest of
+    the body is still on the wire and only one row is held in memory at a time. Other top-level fields
+    ('total', ...) are parsed when first asked for; rows read past on the way are buffered until iterated.
+
+    param chunks: Iterable of bytes chunks, e.g. resp.iter_content(DEFAULT_CHUNK_SIZE).
+    param array_key: Name of the top-level array handed out row by row.
+    param on_end: Called with the body once, when its last chunk was read, reading a chunk failed or it is
+        closed; it must not hold on to the chunks iterator, so that an abandoned body is freed right away.
+    param offsets: Sequence the start and end byte offset of every row of the array are appended to, e.g. an
+        array('Q'); None does not track them.
+    """
+
+    def __init__(self, chunks, array_key="values", on_end=None, offsets=None):
+        self.array_key = array_key
+        self._chunks = iter(chunks)
+        self._on_end = on_end
+        self._offsets = offsets
+        # A position in the buffer and the bytes of the body before it, see _byte_offset
+        self._mark_pos = 0
+        self._mark_bytes = 0
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self._state = "start"
+        self._fields = {}
+        self._ahead = deque()
+        self._rows = self._iter_rows()
+        # Rows parsed so far, whether handed out or still buffered
+        self.row_count = 0
+
+    def __getitem__(self, key):
+        value = self.get(key, _END)
+        if value is _END:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.get(key, _END) is not _END
+
+    def close(self):
+        """Stop reading: the remaining chunks are not read and on_end is called unless it already was."""
+        close = getattr(self._chunks, "close", None)
+        if close is not None:
+            close()
+        self._eof = True
+        self._end()
+
+    def _end(self):
+        on_end, self._on_end = self._on_end, None
+        if on_end is not None:
+            on_end(self)
+
+    @property
+    def fields(self):
+        """Top-level fields parsed so far, without reading any further."""
+        return dict(self._fields)
+
+    def get(self, key, default=None):
+        """Returns the rows iterator for the array key, otherwise the parsed top-level field."""
+        if key == self.array_key:
+            return self._rows
+
+        while key not in self._fields and self._state != "done":
+            if self._state == "array":
+                row = self._next_row()
+                if row is not _END:
+                    self._ahead.append(row)
+            else:
+                self._next_member()
+        return self._fields.get(key, default)
+
+    def _iter_rows(self):
+        while self._state in ("start", "members"):
+            self._next_member()
+        while True:
+            if self._ahead:
+                yield self._ahead.popleft()
+            elif self._state == "array":
+                row = self._next_row()
+                if row is not _END:
+                    yield row
+            else:
+                # Parse the members following the array, so iterating the rows to the end completes the body
+                while self._state == "members":
+                    self._next_member()
+                return
+
+    def _next_member(self):
+        """Parse top-level members until the array starts or the object ends."""
+        if self._state == "start":
+            self._expect("{")
+            self._state = "members"
+
+        while self._state == "members":
+            ch = self._peek()
+            if ch == "}":
+                self._pos += 1
+                self._state = "done"
+                # Read up to the end of the response, which completes the body
+                while not self._eof:
+                    self._fill()
+                return
+            if ch == ",":
+                self._pos += 1
+                continue
+
+            key = self._value()
+            self._expect(":")
+            if key == self.array_key and self._peek() == "[":
+                self._pos += 1
+                self._state = "array"
+                return
+            self._fields[key] = self._value()
+            return
+
+    def _next_row(self):
+        """Returns the next row of the array, or _END once its closing bracket is consumed."""
+        ch = self._peek()
+        if ch == ",":
+            self._pos += 1
+            ch = self._peek()
+        if ch == "]":
+            self._pos += 1
+            self._state = "members"
+            return _END
+        if self._offsets is None:
+            row = self._value()
+        else:
+            start = self._byte_offset()
+            row = self._value()
+            self._offsets.extend((start, self._byte_offset()))
+        self.row_count += 1
+        return row
+
+    def _byte_offset(self):
+        """Returns the bytes of the body before the current position, encoding only the text since the last call."""
+        self._mark_bytes += len(self._buf[self._mark_pos:self._pos].encode())
+        self._mark_pos = self._pos
+        return self._mark_bytes
+
+    def _value(self):
+        self._skip_whitespace()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._buf, self._pos)
+                # A value touching the end of the buffer may continue in the next chunk (e.g. a number)
+                if end < len(self._buf) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            self._fill()
+
+    def _expect(self, ch):
+        if self._peek() != ch:
+            raise json.JSONDecodeError(f"Expecting '{ch}'", self._buf, self._pos)
+        self._pos += 1
+
+    def _peek(self):
+        self._skip_whitespace()
+        if self._pos >= len(self._buf):
+            raise json.JSONDecodeError("Unexpected end of response body", self._buf, self._pos)
+        return self._buf[self._pos]
+
+    def _skip_whitespace(self):
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf) or self._eof:
+                return
+            self._fill()
+
+    def _fill(self):
+        if self._pos > _COMPACT_AFTER:
+            if self._offsets is not None:
+                self._byte_offset()
+                self._mark_pos = 0
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+
+        try:
+            chunk = next(self._chunks, None)
+        except Exception:
+            self._eof = True
+            self._end()
+            raise
+        if chunk is None:
+            self._eof = True
+            self._buf += self._text.decode(b"", final=True)
+            self._end()
+        else:
+            self._buf += self._text.decode(chunk)
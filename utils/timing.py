@@ -0,0 +1,219 @@
+import json
+import socket
+import threading
+import time
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NewConnectionError
+from urllib3.util.connection import allowed_gai_family
+
+from utils.deadline import watch_connection
+
+# Phases of one request, in the order they happen. For streamed bodies decode is part of download;
+# other bodies are decoded lazily, so their decode time is reported on its own once it happens.
+PHASES = ("dns", "connect", "tls", "ttfb", "download", "decode")
+
+_local = threading.local()
+_lock = threading.Lock()
+_file = None
+_current_test = None
+_current_properties = None
+_totals = {}
+# Origin -> TCP (or Unix socket) connections opened to it
+_handshakes = {}
+
+
+class _TimedConnectionMixin:
+    def _new_conn(self):
+        # A pooled connection object opens a new socket whenever the server closed the previous one
+        count_handshake(f"{'https' if isinstance(self, HTTPSConnection) else 'http'}://{self.host}:{self.port}")
+        # Resolve the host separately so name resolution and the TCP handshake are timed apart
+        start = time.perf_counter()
+        host = self._dns_host
+        try:
+            address = socket.getaddrinfo(host, self.port, allowed_gai_family(), socket.SOCK_STREAM)[0][4][0]
+        except socket.gaierror:
+            # urllib3 raises its own NameResolutionError below
+            address = host
+        resolved = time.perf_counter()
+        add_phase("dns", resolved - start)
+
+        self._dns_host = address
+        try:
+            return super()._new_conn()
+        except NewConnectionError:
+            if address == host:
+                raise
+            # Let urllib3 try every address of the host when the first one is unreachable
+            self._dns_host = host
+            return super()._new_conn()
+        finally:
+            self._dns_host = host
+            add_phase("connect", time.perf_counter() - resolved)
+
+    def getresponse(self):
+        # A response trickling in is cut off at the request's deadline, see utils.deadline.enforce
+        watch_connection(self)
+        start = time.perf_counter()
+        try:
+            return super().getresponse()
+        finally:
+            add_phase("ttfb", time.perf_counter() - start)
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    def connect(self):
+        start = time.perf_counter()
+        before = _phase("dns") + _phase("connect")
+        try:
+            super().connect()
+        finally:
+            handshake = _phase("dns") + _phase("connect") - before
+            add_phase("tls", max(time.perf_counter() - start - handshake, 0.0))
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections report DNS, connect, TLS and time-to-first-byte to utils.timing."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": TimedHTTPConnectionPool, "https": TimedHTTPSConnectionPool}
+
+
+def begin():
+    """Start timing a request sent from the current thread."""
+    _local.phases = dict.fromkeys(PHASES, 0.0)
+    _local.start = time.perf_counter()
+
+
+def finish():
+    """
+    Stop timing the request of the current thread; the time not spent in another phase counts as download.
+
+    Returns:
+        dict: Phase -> seconds.
+    """
+    phases = _local.phases
+    _local.phases = None
+    phases["download"] = max(time.perf_counter() - _local.start - sum(phases.values()), 0.0)
+    return phases
+
+
+def add_phase(phase, seconds):
+    """Add seconds to a phase of the request the current thread is timing."""
+    phases = getattr(_local, "phases", None)
+    if phases is not None:
+        phases[phase] += seconds
+
+
+def count_handshake(origin):
+    """Count one connection opened to origin, e.g. 'https://host:443'."""
+    with _lock:
+        _handshakes[origin] = _handshakes.get(origin, 0) + 1
+
+
+def handshakes(origin):
+    """Returns the number of connections opened to origin so far."""
+    with _lock:
+        return _handshakes.get(origin, 0)
+
+
+def _phase(phase):
+    phases = getattr(_local, "phases", None)
+    return phases[phase] if phases is not None else 0.0
+
+
+def configure_timings(path=None):
+    """
+    Write the phases of every request fetch_get sends to a JSON lines file.
+
+    param path: File to write, None to only keep the totals.
+    """
+    global _file
+    close_timings()
+    _totals.clear()
+    if path:
+        _file = open(path, "w", buffering=1)
+
+
+def close_timings():
+    global _file
+    with _lock:
+        if _file is not None:
+            _file.close()
+            _file = None
+
+
+def set_current_test(test_id, properties=None):
+    """
+    Attribute the requests sent from now on to a test.
+
+    param test_id: Identifier written with every request, e.g. the pytest node id.
+    param properties: List every request is appended to as ('indexer_request', timings), e.g. item.user_properties.
+    """
+    global _current_test, _current_properties
+    _current_test = test_id
+    _current_properties = properties
+
+
+def current_test():
+    """Returns the identifier of the test requests are attributed to, or None."""
+    return _current_test
+
+
+def record(url, resp, test=None):
+    """
+    Report the phases a response collected in resp.timings; responses without timings are ignored.
+
+    param test: Node id of the test the request was sent for ahead of time, e.g. by the prefetch phase; it was
+        not part of that test's run, so it is not added to its properties. None for the running test.
+    """
+    phases = getattr(resp, "timings", None)
+    if phases is None:
+        return
+
+    entry = {"test": _current_test if test is None else test, "url": url, "status": resp.status_code}
+    entry.update((phase, round(phases[phase], 6)) for phase in PHASES)
+    entry["total"] = round(sum(phases.values()), 6)
+
+    properties = _current_properties if test is None else None
+    if properties is not None:
+        properties.append(("indexer_request", entry))
+    with _lock:
+        _totals["requests"] = _totals.get("requests", 0) + 1
+        for phase in PHASES:
+            _totals[phase] = _totals.get(phase, 0.0) + phases[phase]
+        if _file is not None:
+            _file.write(json.dumps(entry) + "\n")
+
+
+def record_decode(url, seconds):
+    """Report the decode time of a lazily decoded body."""
+    entry = {"test": _current_test, "url": url, "decode": round(seconds, 6)}
+    properties = _current_properties
+    if properties is not None:
+        properties.append(("indexer_decode", entry))
+    with _lock:
+        _totals["decode"] = _totals.get("decode", 0.0) + seconds
+        if _file is not None:
+            _file.write(json.dumps(entry) + "\n")
+
+
+def timing_stats():
+    """Returns {'requests', <phase>: summed seconds, ...} for the requests recorded so far."""
+    with _lock:
+        return {"requests": 0, **dict.fromkeys(PHASES, 0.0), **_totals}
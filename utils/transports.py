@@ -0,0 +1,280 @@
+import abc
+import asyncio
+import importlib
+import inspect
+import io
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from http import HTTPStatus
+from urllib.parse import unquote, urlsplit
+
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.exceptions import ReadTimeout
+from urllib3 import HTTPResponse
+from urllib3.connectionpool import HTTPConnectionPool
+
+from utils.timing import TimedHTTPConnection, add_phase, count_handshake
+
+UNIX_SCHEME = "http+unix://"
+
+
+class UnixHTTPConnection(TimedHTTPConnection):
+    """HTTP connection over a Unix domain socket."""
+
+    def __init__(self, socket_path, *args, **kwargs):
+        self.socket_path = socket_path
+        super().__init__(*args, **kwargs)
+
+    def _new_conn(self):
+        count_handshake(UNIX_SCHEME + self.socket_path)
+        start = time.perf_counter()
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        finally:
+            add_phase("connect", time.perf_counter() - start)
+        return sock
+
+
+class UnixHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = UnixHTTPConnection
+
+    def __init__(self, socket_path, **kwargs):
+        self.socket_path = socket_path
+        # Shown by utils.session.connection_stats instead of scheme://host:port
+        self.origin = UNIX_SCHEME + socket_path
+        super().__init__("localhost", **kwargs)
+
+    def _new_conn(self):
+        self.num_connections += 1
+        return self.ConnectionCls(self.socket_path, host=self.host, port=self.port,
+                                  timeout=self.timeout.connect_timeout, **self.conn_kw)
+
+
+class UnixHTTPAdapter(HTTPAdapter):
+    """
+    Sends http+unix://<percent-encoded socket path>/<path> URLs over a Unix domain socket, e.g.
+    http+unix://%2Frun%2Findexer.sock/api/v1/events/GetByFiltersDepositedsIdx1.
+    """
+
+    def get_connection_with_tls_context(self, request, verify, proxies=None, cert=None):
+        return self._pool_for(request.url)
+
+    def get_connection(self, url, proxies=None):
+        return self._pool_for(url)
+
+    def request_url(self, request, proxies):
+        return request.path_url
+
+    def _pool_for(self, url):
+        socket_path = unquote(urlsplit(url).netloc)
+        with self.poolmanager.pools.lock:
+            pool = self.poolmanager.pools.get(socket_path)
+            if pool is None:
+                pool = UnixHTTPConnectionPool(socket_path, maxsize=self._pool_maxsize, block=self._pool_block)
+                self.poolmanager.pools[socket_path] = pool
+        return pool
+
+
+class _AppAdapter(BaseAdapter, metaclass=abc.ABCMeta):
+    """
+    Dispatches requests straight to an in-process application instead of a socket.
+
+    The read part of a request's timeout bounds the whole call of the application, which then raises
+    requests.ReadTimeout; there is no connection, so the connect part does not apply.
+    """
+
+    def __init__(self, app):
+        super().__init__()
+        self.app = app
+        self._builder = HTTPAdapter()
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        start = time.perf_counter()
+        status, reason, headers, body = self._call(request, _read_timeout(timeout))
+        add_phase("ttfb", time.perf_counter() - start)
+
+        raw = HTTPResponse(body=io.BytesIO(body), headers=headers, status=status, reason=reason,
+                           preload_content=False, decode_content=True)
+        return self._builder.build_response(request, raw)
+
+    def close(self):
+        self._builder.close()
+
+    @abc.abstractmethod
+    def _call(self, request, timeout):
+        """
+        Returns (status, reason, headers, body bytes) for a PreparedRequest.
+
+        param timeout: Seconds the application may take; None waits for it.
+
+        Raises:
+            requests.ReadTimeout: If the application did not answer within timeout.
+        """
+
+
+def _read_timeout(timeout):
+    """Returns the read timeout of a timeout given to send: seconds, a (connect, read) tuple or None."""
+    if isinstance(timeout, tuple):
+        return timeout[1]
+    return timeout
+
+
+class WSGIAdapter(_AppAdapter):
+    """
+    Calls a WSGI application in worker threads, so the sending thread can stop waiting for it at its timeout.
+
+    A call that timed out keeps its worker until the application returns; WSGI has no way to cancel it.
+    """
+
+    def __init__(self, app):
+        super().__init__(app)
+        self._workers = ThreadPoolExecutor(thread_name_prefix="wsgi-transport")
+
+    def close(self):
+        self._workers.shutdown(wait=False)
+        super().close()
+
+    def _call(self, request, timeout):
+        try:
+            return self._workers.submit(self._call_app, request).result(timeout)
+        except FutureTimeout:
+            raise ReadTimeout(f"The WSGI application did not answer within {timeout:g}s", request=request) from None
+
+    def _call_app(self, request):
+        parts = urlsplit(request.url)
+        body = request.body or b""
+        if isinstance(body, str):
+            body = body.encode()
+        environ = {
+            "REQUEST_METHOD": request.method,
+            "SCRIPT_NAME": "",
+            "PATH_INFO": unquote(parts.path) or "/",
+            "QUERY_STRING": parts.query,
+            "SERVER_NAME": parts.hostname or "localhost",
+            "SERVER_PORT": str(parts.port or (443 if parts.scheme == "https" else 80)),
+            "SERVER_PROTOCOL": "HTTP/1.1",
+            "CONTENT_LENGTH": str(len(body)),
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": parts.scheme,
+            "wsgi.input": io.BytesIO(body),
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+        }
+        for name, value in request.headers.items():
+            key = name.upper().replace("-", "_")
+            if key not in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+                key = "HTTP_" + key
+            environ[key] = value
+
+        started = {}
+
+        def start_response(status, response_headers, exc_info=None):
+            started["status"] = status
+            started["headers"] = response_headers
+
+        result = self.app(environ, start_response)
+        try:
+            content = b"".join(result)
+        finally:
+            if hasattr(result, "close"):
+                result.close()
+
+        code, _, reason = started["status"].partition(" ")
+        return int(code), reason, started["headers"], content
+
+
+class ASGIAdapter(_AppAdapter):
+    """Runs an ASGI application on an event loop of its own, shared by all sending threads and kept for the run."""
+
+    def __init__(self, app):
+        super().__init__(app)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="asgi-transport", daemon=True)
+        self._thread.start()
+
+    def _call(self, request, timeout):
+        future = asyncio.run_coroutine_threadsafe(self._call_app(request), self._loop)
+        try:
+            return future.result(timeout)
+        except FutureTimeout:
+            # Cancels the application's task on the loop
+            future.cancel()
+            raise ReadTimeout(f"The ASGI application did not answer within {timeout:g}s", request=request) from None
+
+    async def _call_app(self, request):
+        parts = urlsplit(request.url)
+        body = request.body or b""
+        if isinstance(body, str):
+            body = body.encode()
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0", "spec_version": "2.3"},
+            "http_version": "1.1",
+            "method": request.method,
+            "scheme": parts.scheme,
+            "path": unquote(parts.path) or "/",
+            "raw_path": (parts.path or "/").encode(),
+            "query_string": parts.query.encode(),
+            "root_path": "",
+            "headers": [(name.lower().encode(), value.encode()) for name, value in request.headers.items()],
+            "client": None,
+            "server": (parts.hostname or "localhost", parts.port or 80),
+        }
+        received = False
+        started = {}
+        chunks = []
+        responded = asyncio.Event()
+
+        async def receive():
+            nonlocal received
+            if received:
+                # Nothing else arrives; the client goes away once it has the whole response
+                await responded.wait()
+                return {"type": "http.disconnect"}
+            received = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                started["status"] = message["status"]
+                started["headers"] = [(name.decode(), value.decode()) for name, value in message.get("headers", [])]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    responded.set()
+
+        await self.app(scope, receive, send)
+        status = started["status"]
+        reason = HTTPStatus(status).phrase if status in HTTPStatus._value2member_map_ else ""
+        return status, reason, started["headers"], b"".join(chunks)
+
+
+def load_app(spec):
+    """
+    Import an application given as 'package.module:attribute'.
+
+    Returns:
+        tuple: (app, 'asgi' or 'wsgi'); coroutine callables are taken for ASGI applications.
+    """
+    module_name, _, attribute = spec.partition(":")
+    if not attribute:
+        raise ValueError(f"Expected 'module:attribute', got '{spec}'")
+    app = getattr(importlib.import_module(module_name), attribute)
+    call = app if inspect.isfunction(app) or inspect.ismethod(app) else getattr(app, "__call__", app)
+    return app, "asgi" if inspect.iscoroutinefunction(call) else "wsgi"
+
+
+def app_adapter(app, interface):
+    """Returns the adapter dispatching to app; interface is 'wsgi' or 'asgi'."""
+    return ASGIAdapter(app) if interface == "asgi" else WSGIAdapter(app)
@@ -0,0 +1,67 @@
+import threading
+
+from urllib3.util.request import ACCEPT_ENCODING
+
+from utils.query import prepare_query
+
+# Content codings urllib3 can decode in this environment (br needs brotli, zstd needs zstandard)
+SUPPORTED_ENCODINGS = ["identity"] + ACCEPT_ENCODING.split(",")
+DEFAULT_ACCEPT_ENCODING = ACCEPT_ENCODING.replace(",", ", ")
+# Headers describing how a body travelled rather than the body, dropped when a decoded body is stored
+WIRE_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive"}
+
+_lock = threading.Lock()
+_by_endpoint = {}
+_by_shape = {}
+
+
+def accept_encoding_header(encodings):
+    """
+    Build the Accept-Encoding header for a comma separated list of codings, e.g. 'zstd,br,gzip'.
+
+    Raises:
+        ValueError: If a coding cannot be decoded here.
+    """
+    names = [name.strip() for name in encodings.split(",") if name.strip()]
+    missing = [name for name in names if name not in SUPPORTED_ENCODINGS]
+    if missing:
+        raise ValueError(f"Cannot decode {', '.join(missing)} responses, supported: {', '.join(SUPPORTED_ENCODINGS)}")
+    return ", ".join(names)
+
+
+def stored_headers(headers):
+    """Returns the headers of a response to keep with its decoded body, without WIRE_HEADERS."""
+    return {name: value for name, value in headers.items() if name.lower() not in WIRE_HEADERS}
+
+
+def account(url, params, resp, body_bytes):
+    """
+    Record the compressed and decompressed size of one response body.
+
+    The sizes are also set on the response as resp.wire_bytes and resp.body_bytes.
+
+    param body_bytes: Decompressed body size.
+    """
+    raw = resp.raw
+    wire_bytes = raw.tell() if raw is not None and hasattr(raw, "tell") else body_bytes
+    resp.wire_bytes = wire_bytes
+    resp.body_bytes = body_bytes
+    resp.content_encoding = resp.headers.get("Content-Encoding", "identity")
+
+    prepared = prepare_query(url, params)
+    with _lock:
+        for table, key in ((_by_endpoint, prepared.endpoint), (_by_shape, prepared.shape)):
+            entry = table.setdefault(key, {"requests": 0, "wire_bytes": 0, "body_bytes": 0})
+            entry["requests"] += 1
+            entry["wire_bytes"] += wire_bytes
+            entry["body_bytes"] += body_bytes
+
+
+def wire_stats():
+    """
+    Returns:
+        tuple: (by endpoint, by filter type), each name -> {'requests', 'wire_bytes', 'body_bytes'}.
+    """
+    with _lock:
+        return ({key: dict(entry) for key, entry in _by_endpoint.items()},
+                {key: dict(entry) for key, entry in _by_shape.items()})